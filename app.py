@@ -1,45 +1,106 @@
 import os
-import glob
+import io
+import bisect
 import atexit
 import time
 import random
+import itertools
 from google.genai import types
 from google.genai import Client
-import json
+import orjson
 import tempfile
 import logging
 import datetime
 import re
 import statistics
 import requests
-from flask import Flask, request, render_template, jsonify, send_file, url_for
+from flask import Flask, Response, request, render_template, jsonify, send_file, url_for
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from google.cloud import speech
 from google.cloud import storage
+from google.cloud.storage.retry import DEFAULT_RETRY
 from google.cloud import texttospeech
 from google.api_core import exceptions
-from fuzzywuzzy import fuzz
-import uuid
+from rapidfuzz import fuzz, utils
+import hashlib
+import copy
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson"""
+
+    def dumps(self, obj, **kwargs):
+        # Honour the provider settings Flask passes through: sort_keys
+        # (app.json.sort_keys) and indent (pretty-printed responses in debug)
+        option = 0
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Compress JSON and HTML responses, preferring Brotli when the client accepts it.
+# audio/mpeg is deliberately not listed: TTS MP3 is already compressed and its
+# send_file range responses must reach the client byte-for-byte
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIMETYPES'] = [
+    'text/html', 'text/css', 'text/xml', 'application/json', 'application/javascript'
+]
+Compress(app)
 
 # Configure Cloud Storage - Get bucket name from environment variable
 BUCKET_NAME = os.environ.get('BUCKET_NAME', 'strawberry-cupcake-files')
 storage_client = storage.Client()
 
+# Google API clients are thread-safe; create them once so the gRPC channels
+# (credential discovery, TLS handshake) are reused across requests
+speech_client = speech.SpeechClient()
+tts_client = texttospeech.TextToSpeechClient()
+
+# The Gemini client needs GEMINI_API_KEY, which is optional, so it is created
+# on first use instead of at import
+_gemini_client = None
+_gemini_client_lock = threading.Lock()
+
+def get_gemini_client():
+    """Return the shared Gemini client, creating it on first call"""
+    global _gemini_client
+    if _gemini_client is None:
+        with _gemini_client_lock:
+            if _gemini_client is None:
+                _gemini_client = Client()
+    return _gemini_client
+
 # Configure tracking webhook URL
 TRACKING_WEBHOOK_URL = os.environ.get('TRACKING_WEBHOOK_URL', '')
 
+# Check for (and create) the bucket at startup; otherwise no Storage request is
+# made during import and the bucket is verified by its first upload
+AUTO_CREATE_BUCKET = os.environ.get('STRAWBERRY_AUTO_CREATE_BUCKET') == '1'
+
 def get_or_create_bucket(bucket_name):
     """Obtiene un bucket existente o crea uno nuevo."""
+    if not AUTO_CREATE_BUCKET:
+        # Referencia local sin llamadas a la API; se verifica en el primer uso
+        # (ver _mark_bucket_verified y _mark_bucket_unavailable)
+        return storage_client.bucket(bucket_name)
+
     try:
-        # Inicializa el cliente con autenticación implícita
-        storage_client = storage.Client()
-        
-        # Intenta obtener el bucket
+        # Intenta obtener el bucket con el cliente del módulo
         try:
             bucket = storage_client.get_bucket(bucket_name)
             logger.info(f"Conexión exitosa con el bucket: {bucket_name}")
@@ -60,6 +121,32 @@ def get_or_create_bucket(bucket_name):
 
 bucket = get_or_create_bucket(BUCKET_NAME)
 
+# 'verified' once Storage has confirmed the bucket, 'unverified' while it is only
+# configured, 'unavailable' when it could not be used (bucket is None then)
+if bucket is None:
+    bucket_status = 'unavailable'
+elif AUTO_CREATE_BUCKET:
+    bucket_status = 'verified'
+else:
+    bucket_status = 'unverified'
+
+def _mark_bucket_verified():
+    """Record that a Storage request on the bucket succeeded"""
+    global bucket_status
+    bucket_status = 'verified'
+
+def _mark_bucket_unavailable(error):
+    """Stop using a bucket that Storage reported missing
+
+    Clearing the module-level bucket sends later requests down the local
+    fallbacks (inline recognition, local TTS files) instead of failing again.
+    """
+    global bucket, bucket_status
+    if bucket is not None:
+        logger.error(f"Bucket {BUCKET_NAME} is unavailable, using local fallbacks: {error}")
+    bucket = None
+    bucket_status = 'unavailable'
+
 # Create TTS temp directory for audio files
 TTS_TEMP_DIR = os.path.join(tempfile.gettempdir(), 'strawberry_tts')
 os.makedirs(TTS_TEMP_DIR, exist_ok=True)
@@ -67,27 +154,68 @@ os.makedirs(TTS_TEMP_DIR, exist_ok=True)
 # TTS file max age in seconds (2 hours)
 TTS_FILE_MAX_AGE = 2 * 60 * 60
 
+# Maximum number of TTS files kept in the local fallback directory
+TTS_MAX_LOCAL_FILES = 100
+
+# Files written within this many seconds are never evicted by the count limit,
+# so URLs just returned to clients stay valid during a burst of requests
+TTS_EVICTION_GRACE_PERIOD = 5 * 60
+
+def _iter_tts_files():
+    """Yield directory entries for the tts_*.mp3 files in TTS_TEMP_DIR"""
+    with os.scandir(TTS_TEMP_DIR) as entries:
+        for entry in entries:
+            if entry.name.startswith('tts_') and entry.name.endswith('.mp3'):
+                yield entry
+
 def cleanup_old_tts_files():
-    """Remove TTS files older than TTS_FILE_MAX_AGE"""
+    """Remove TTS files older than TTS_FILE_MAX_AGE and evict the oldest
+    files beyond TTS_MAX_LOCAL_FILES, sparing files younger than
+    TTS_EVICTION_GRACE_PERIOD"""
     try:
         current_time = time.time()
-        for filepath in glob.glob(os.path.join(TTS_TEMP_DIR, 'tts_*.mp3')):
+        remaining_files = []
+        removed_count = 0
+        for entry in _iter_tts_files():
+            filepath = entry.path
             try:
-                file_age = current_time - os.path.getmtime(filepath)
-                if file_age > TTS_FILE_MAX_AGE:
+                modified_time = entry.stat().st_mtime
+                if current_time - modified_time > TTS_FILE_MAX_AGE:
                     os.remove(filepath)
-                    logger.info(f"Cleaned up old TTS file: {filepath}")
+                    removed_count += 1
+                    logger.debug(f"Cleaned up old TTS file: {filepath}")
+                else:
+                    remaining_files.append((modified_time, filepath))
             except OSError as e:
                 logger.warning(f"Error removing TTS file {filepath}: {e}")
+
+        # Bound the directory size: evict least recently written files first
+        excess = len(remaining_files) - TTS_MAX_LOCAL_FILES
+        if excess > 0:
+            remaining_files.sort()
+            for modified_time, filepath in remaining_files[:excess]:
+                if current_time - modified_time < TTS_EVICTION_GRACE_PERIOD:
+                    # Sorted oldest first: every remaining file is also within the grace period
+                    break
+                try:
+                    os.remove(filepath)
+                    removed_count += 1
+                    logger.debug(f"Evicted TTS file over limit: {filepath}")
+                except OSError as e:
+                    logger.warning(f"Error removing TTS file {filepath}: {e}")
+
+        # One summary line per sweep; per-file details are only logged at DEBUG
+        if removed_count:
+            logger.info(f"Cleaned up {removed_count} TTS files")
     except Exception as e:
         logger.warning(f"Error during TTS cleanup: {e}")
 
 def cleanup_all_tts_files():
     """Remove all TTS files on shutdown"""
     try:
-        for filepath in glob.glob(os.path.join(TTS_TEMP_DIR, 'tts_*.mp3')):
+        for entry in _iter_tts_files():
             try:
-                os.remove(filepath)
+                os.remove(entry.path)
             except OSError:
                 pass
         logger.info("Cleaned up all TTS files on shutdown")
@@ -105,6 +233,11 @@ app.config['MAX_CONTENT_LENGTH'] = 20 * 1024 * 1024
 
 # Allowed audio file extensions
 ALLOWED_EXTENSIONS = {'wav', 'mp3', 'm4a', 'opus', 'webm', 'ogg'}
+# Same extensions as dotted suffixes, for a single str.endswith check
+ALLOWED_SUFFIXES = tuple(f'.{extension}' for extension in ALLOWED_EXTENSIONS)
+
+# Proficiency levels accepted from the client
+VALID_LEVELS = frozenset({'beginner', 'intermediate', 'advanced'})
 
 # Add X-Robots-Tag header to prevent search engine indexing
 @app.after_request
@@ -115,22 +248,21 @@ def add_security_headers(response):
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(ALLOWED_SUFFIXES)
 
 # Load reference phrases for assessment and practice
 def load_references():
     """Load reference phrases from file or provide defaults"""
     try:
         try:
-            with open("references.json", "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open("references.json", "rb") as f:
+                return orjson.loads(f.read())
         except FileNotFoundError:
             if bucket:
                 blob = bucket.blob('references.json')
                 try:
-                    if blob.exists():
-                        content = blob.download_as_string().decode('utf-8')
-                        return json.loads(content)
+                    # Single GET; a missing object raises NotFound
+                    return orjson.loads(blob.download_as_bytes())
                 except exceptions.NotFound:
                     logger.warning(f"References file not found in bucket {BUCKET_NAME}")
             # Default references if file not found
@@ -150,7 +282,124 @@ def load_references():
 # Initialize references
 REFERENCES = load_references()
 
+# References never change after startup, so serialize them once
+REFERENCES_JSON = orjson.dumps(REFERENCES)
+
+# Reference phrases normalized once for fuzzy matching (lowercase, no punctuation)
+PROCESSED_REFERENCES = {key: utils.default_process(text) for key, text in REFERENCES.items()}
+
+def _extract_words(results):
+    """Collect the transcript and word-level data from Speech-to-Text results
+
+    Returns:
+        tuple: (transcript, words) where words is a list of dicts with
+        'word', 'start_time', 'end_time' (seconds) and 'confidence'
+    """
+    transcript_parts = []
+    all_words = []
+
+    for result in results:
+        alternative = result.alternatives[0]
+        transcript_parts.append(alternative.transcript)
+
+        # Timing and confidence are always populated: the recognition config
+        # enables word time offsets and word confidence
+        for word_info in alternative.words:
+            all_words.append({
+                'word': word_info.word,
+                'start_time': word_info.start_time.total_seconds(),
+                'end_time': word_info.end_time.total_seconds(),
+                'confidence': word_info.confidence
+            })
+
+    return " ".join(transcript_parts), all_words
+
+def _recognize_inline(client, config, audio_content):
+    """Transcribe in-memory audio with the synchronous recognize() call
+
+    Returns:
+        dict: {
+            'transcript': str - Full transcribed text ('' when nothing was recognized),
+            'words': list - Word objects with timing and confidence data
+        }
+    """
+    audio = speech.RecognitionAudio(content=audio_content)
+    response = client.recognize(config=config, audio=audio)
+    transcript, all_words = _extract_words(response.results)
+    return {
+        'transcript': transcript,
+        'words': all_words
+    }
+
+# Recent transcriptions keyed by a digest of the audio bytes, so retried
+# uploads of the same recording skip the Speech-to-Text round trip
+TRANSCRIPTION_CACHE_SIZE = 64
+_transcription_cache = OrderedDict()
+_transcription_cache_lock = threading.Lock()
+
 def transcribe_audio(audio_content):
+    """Transcribe audio, reusing the result for recently seen identical uploads
+
+    Only successful (non-empty) transcriptions are cached so that transient
+    API failures are retried on the next upload.
+
+    Returns:
+        dict: {
+            'transcript': str - Full transcribed text,
+            'words': list - Word objects with timing and confidence data
+        }
+    """
+    digest = hashlib.blake2b(audio_content, digest_size=16).digest()
+
+    with _transcription_cache_lock:
+        cached = _transcription_cache.get(digest)
+        if cached is not None:
+            _transcription_cache.move_to_end(digest)
+
+    if cached is not None:
+        logger.info("Reusing cached transcription for identical audio upload")
+        return cached
+
+    transcription_data = _transcribe_audio_uncached(audio_content)
+
+    if transcription_data['transcript']:
+        with _transcription_cache_lock:
+            _transcription_cache[digest] = transcription_data
+            if len(_transcription_cache) > TRANSCRIPTION_CACHE_SIZE:
+                _transcription_cache.popitem(last=False)
+
+    return transcription_data
+
+# Transcription errors that skip the inline recognize() fallback: timeouts
+# (FutureTimeoutError is raised by operation.result() when long_running_recognize()
+# exceeds its timeout) and Speech backend outages (ServiceUnavailable, exhausted
+# retries), where another call to the same failing service would only add latency
+NO_FALLBACK_EXCEPTIONS = (
+    TimeoutError,
+    FutureTimeoutError,
+    exceptions.DeadlineExceeded,
+    exceptions.ServiceUnavailable,
+    exceptions.RetryError
+)
+
+# Temporary audio object names combine a random per-process prefix, drawn once at
+# import, with the timestamp and a per-process sequence. Inside containers pids
+# and counters repeat across instances, so the prefix is what keeps two instances apart
+_TEMP_AUDIO_PREFIX = os.urandom(4).hex()
+_temp_audio_counter = itertools.count()
+
+# Deletes temporary audio uploads in the background once recognition is done
+STORAGE_CLEANUP_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='gcs-cleanup')
+
+def _delete_temp_blob(blob):
+    """Delete a temporary audio upload, logging instead of raising on failure"""
+    try:
+        blob.delete()
+        logger.info(f"Deleted temporary file: {blob.name}")
+    except Exception as cleanup_error:
+        logger.warning(f"Could not delete temporary file: {cleanup_error}")
+
+def _transcribe_audio_uncached(audio_content):
     """Transcribe Spanish audio using Google Cloud Speech-to-Text with support for up to 2 minutes
 
     Returns:
@@ -159,7 +408,7 @@ def transcribe_audio(audio_content):
             'words': list - Word objects with timing and confidence data
         }
     """
-    client = speech.SpeechClient()
+    client = speech_client
 
     # Check audio size to determine which method to use
     # Conservative threshold: 200 KB ensures ~50-60 seconds at 32 kbps stays within
@@ -191,84 +440,32 @@ def transcribe_audio(audio_content):
         # For shorter audio (<=50 seconds at 32kbps), use fast inline recognize()
         if audio_size <= SIZE_THRESHOLD:
             logger.info(f"Using fast inline recognize() method (audio size: {audio_size / 1024:.1f} KB <= {SIZE_THRESHOLD / 1024:.0f} KB threshold)")
-            audio = speech.RecognitionAudio(content=audio_content)
-            response = client.recognize(config=config, audio=audio)
+            transcription_data = _recognize_inline(client, config, audio_content)
 
-            if response.results:
-                # Extract transcript and word data
-                transcript_parts = []
-                all_words = []
-
-                for result in response.results:
-                    alternative = result.alternatives[0]
-                    transcript_parts.append(alternative.transcript)
-
-                    # Extract word-level data with timing and confidence
-                    if hasattr(alternative, 'words') and alternative.words:
-                        for word_info in alternative.words:
-                            word_data = {
-                                'word': word_info.word,
-                                'start_time': word_info.start_time.total_seconds() if hasattr(word_info.start_time, 'total_seconds') else 0,
-                                'end_time': word_info.end_time.total_seconds() if hasattr(word_info.end_time, 'total_seconds') else 0,
-                                'confidence': word_info.confidence if hasattr(word_info, 'confidence') else 0.9
-                            }
-                            all_words.append(word_data)
-
-                transcript = " ".join(transcript_parts)
+            transcript = transcription_data['transcript']
+            if transcript:
                 logger.info(f"Inline transcription successful ({len(transcript)} chars): '{transcript[:100]}...'")
-                logger.info(f"Extracted {len(all_words)} words with timing data")
-
-                return {
-                    'transcript': transcript,
-                    'words': all_words
-                }
+                logger.info(f"Extracted {len(transcription_data['words'])} words with timing data")
             else:
                 logger.warning("No transcription results from inline recognize()")
-                return {
-                    'transcript': '',
-                    'words': []
-                }
+            return transcription_data
 
         # For longer audio (>50 seconds at 32kbps), use long_running_recognize() with Cloud Storage
         else:
             logger.info(f"Using long_running_recognize() method (audio size: {audio_size / 1024:.1f} KB > {SIZE_THRESHOLD / 1024:.0f} KB threshold, est. {estimated_duration:.1f}s)")
 
-            if not bucket:
+            # Read once: another request may mark the bucket unavailable meanwhile
+            current_bucket = bucket
+            if not current_bucket:
                 logger.warning("Bucket not available for long audio transcription, attempting fallback to inline recognize()")
                 # Fallback: try inline recognize() even though it might fail for very long audio
                 try:
-                    audio = speech.RecognitionAudio(content=audio_content)
-                    response = client.recognize(config=config, audio=audio)
-                    if response.results:
-                        transcript_parts = []
-                        all_words = []
-
-                        for result in response.results:
-                            alternative = result.alternatives[0]
-                            transcript_parts.append(alternative.transcript)
-
-                            if hasattr(alternative, 'words') and alternative.words:
-                                for word_info in alternative.words:
-                                    word_data = {
-                                        'word': word_info.word,
-                                        'start_time': word_info.start_time.total_seconds() if hasattr(word_info.start_time, 'total_seconds') else 0,
-                                        'end_time': word_info.end_time.total_seconds() if hasattr(word_info.end_time, 'total_seconds') else 0,
-                                        'confidence': word_info.confidence if hasattr(word_info, 'confidence') else 0.9
-                                    }
-                                    all_words.append(word_data)
-
-                        transcript = " ".join(transcript_parts)
-                        logger.info(f"Fallback inline transcription successful: '{transcript}'")
-                        return {
-                            'transcript': transcript,
-                            'words': all_words
-                        }
+                    transcription_data = _recognize_inline(client, config, audio_content)
+                    if transcription_data['transcript']:
+                        logger.info(f"Fallback inline transcription successful: '{transcription_data['transcript']}'")
                     else:
                         logger.error("Fallback inline transcription returned no results")
-                        return {
-                            'transcript': '',
-                            'words': []
-                        }
+                    return transcription_data
                 except Exception as fallback_error:
                     logger.error(f"Fallback inline transcription failed: {str(fallback_error)}")
                     return {
@@ -277,9 +474,31 @@ def transcribe_audio(audio_content):
                     }
 
             # Upload audio to Cloud Storage
-            blob_name = f"temp_audio/{uuid.uuid4()}.webm"
-            blob = bucket.blob(blob_name)
-            blob.upload_from_bytes(audio_content)
+            blob_name = f"temp_audio/{_TEMP_AUDIO_PREFIX}-{time.time_ns():x}-{next(_temp_audio_counter):x}.webm"
+            blob = current_bucket.blob(blob_name)
+            # Single-request upload from memory (recordings are far below any useful
+            # resumable chunk size); the object is deleted right after recognition,
+            # so skip the client-side checksum pass. if_generation_match=0 makes the
+            # create-only request safe to retry on transient errors
+            try:
+                blob.upload_from_file(
+                    io.BytesIO(audio_content),
+                    size=audio_size,
+                    checksum=None,
+                    if_generation_match=0,
+                    retry=DEFAULT_RETRY
+                )
+            except exceptions.PreconditionFailed:
+                # The name is unique per upload (random per-process prefix, timestamp and
+                # sequence): a retried attempt found the object written by an earlier
+                # attempt whose response was lost
+                logger.info(f"Temporary audio already uploaded: {blob_name}")
+            except exceptions.NotFound as e:
+                # Missing bucket: later requests go straight to inline recognition,
+                # this one falls back below
+                _mark_bucket_unavailable(e)
+                raise
+            _mark_bucket_verified()
             logger.info(f"Uploaded audio to gs://{BUCKET_NAME}/{blob_name}")
 
             # Create GCS URI
@@ -292,32 +511,11 @@ def transcribe_audio(audio_content):
             # Wait for operation to complete (timeout 300 seconds)
             response = operation.result(timeout=300)
 
-            # Clean up temporary file
-            try:
-                blob.delete()
-                logger.info(f"Deleted temporary file: {blob_name}")
-            except Exception as cleanup_error:
-                logger.warning(f"Could not delete temporary file: {cleanup_error}")
+            # Clean up temporary file without holding the response on the DELETE round trip
+            STORAGE_CLEANUP_EXECUTOR.submit(_delete_temp_blob, blob)
 
             if response.results:
-                transcript_parts = []
-                all_words = []
-
-                for result in response.results:
-                    alternative = result.alternatives[0]
-                    transcript_parts.append(alternative.transcript)
-
-                    if hasattr(alternative, 'words') and alternative.words:
-                        for word_info in alternative.words:
-                            word_data = {
-                                'word': word_info.word,
-                                'start_time': word_info.start_time.total_seconds() if hasattr(word_info.start_time, 'total_seconds') else 0,
-                                'end_time': word_info.end_time.total_seconds() if hasattr(word_info.end_time, 'total_seconds') else 0,
-                                'confidence': word_info.confidence if hasattr(word_info, 'confidence') else 0.9
-                            }
-                            all_words.append(word_data)
-
-                transcript = " ".join(transcript_parts)
+                transcript, all_words = _extract_words(response.results)
                 logger.info(f"Long-running transcription successful ({len(transcript)} chars): '{transcript[:100]}...'")
                 logger.info(f"Extracted {len(all_words)} words with timing data")
 
@@ -333,15 +531,9 @@ def transcribe_audio(audio_content):
                 }
 
     except Exception as e:
-        # Check if this is a timeout-related exception
-        is_timeout = (
-            isinstance(e, (TimeoutError, exceptions.DeadlineExceeded)) or
-            'timeout' in str(e).lower() or
-            'deadline exceeded' in str(e).lower()
-        )
-
-        if is_timeout:
-            logger.error(f"Timeout error during transcription: {str(e)}")
+        # Timeouts and backend outages are not retried with the inline fallback
+        if isinstance(e, NO_FALLBACK_EXCEPTIONS):
+            logger.error(f"Transcription failed without fallback ({type(e).__name__}): {str(e)}")
             return {
                 'transcript': '',
                 'words': []
@@ -353,32 +545,10 @@ def transcribe_audio(audio_content):
         if audio_size > SIZE_THRESHOLD and audio_size <= 10 * 1024 * 1024:
             logger.info("Attempting fallback to standard recognize()")
             try:
-                audio_inline = speech.RecognitionAudio(content=audio_content)
-                response = client.recognize(config=config, audio=audio_inline)
-                if response.results:
-                    transcript_parts = []
-                    all_words = []
-
-                    for result in response.results:
-                        alternative = result.alternatives[0]
-                        transcript_parts.append(alternative.transcript)
-
-                        if hasattr(alternative, 'words') and alternative.words:
-                            for word_info in alternative.words:
-                                word_data = {
-                                    'word': word_info.word,
-                                    'start_time': word_info.start_time.total_seconds() if hasattr(word_info.start_time, 'total_seconds') else 0,
-                                    'end_time': word_info.end_time.total_seconds() if hasattr(word_info.end_time, 'total_seconds') else 0,
-                                    'confidence': word_info.confidence if hasattr(word_info, 'confidence') else 0.9
-                                }
-                                all_words.append(word_data)
-
-                    transcript = " ".join(transcript_parts)
-                    logger.info(f"Fallback transcription successful: '{transcript}'")
-                    return {
-                        'transcript': transcript,
-                        'words': all_words
-                    }
+                transcription_data = _recognize_inline(client, config, audio_content)
+                if transcription_data['transcript']:
+                    logger.info(f"Fallback transcription successful: '{transcription_data['transcript']}'")
+                    return transcription_data
             except Exception as fallback_error:
                 logger.error(f"Fallback also failed: {str(fallback_error)}")
 
@@ -391,7 +561,39 @@ def transcribe_audio(audio_content):
 # FACT ASSESSMENT SYSTEM - Based on Instructor's Rubric
 # =============================================================================
 
-def evaluate_speech_clarity(transcript, words_data):
+def _has_timing(words_data):
+    """True when every word carries start_time and end_time
+
+    Word time offsets can be missing (e.g. transcripts not produced by the
+    recognition config here); timing-based subcriteria are skipped then.
+    """
+    return all('start_time' in w and 'end_time' in w for w in words_data)
+
+def _word_gaps(words_data):
+    """Silence in seconds between each pair of consecutive words
+
+    Computed once per assessment and shared by C1 (pauses) and C3 (sentence breaks).
+    """
+    return [
+        next_word['start_time'] - word['end_time']
+        for word, next_word in zip(words_data, words_data[1:])
+    ]
+
+# Thinking pause markers (C1.2): a pause after a sentence boundary or after a
+# connector/discourse marker is between ideas, not within a phrase
+THINKING_PUNCTUATION = ('.', '!', '?', ',')
+THINKING_WORDS = frozenset({
+    'y', 'o', 'entonces', 'luego', 'finalmente', 'después', 'además', 'pero',
+    'embargo', 'porque', 'bueno', 'pues', 'este', 'así', 'que', 'primero',
+    'segundo', 'también', 'ahora'
+})
+
+# C1.1 intelligibility ceilings (spec section 2.3): confidence below 0.65 caps
+# the score at 70, below 0.75 at 80, below 0.85 at 90; from 0.85 there is no cap
+CONFIDENCE_CEILING_THRESHOLDS = (0.65, 0.75, 0.85)
+CONFIDENCE_CEILINGS = (70, 80, 90, 100)
+
+def evaluate_speech_clarity(transcript, words_data, gaps=None):
     """C1: Speech Clarity (25% weight)
 
     FACT Spec Section 2: Measures whether a listener can understand the spoken
@@ -405,10 +607,13 @@ def evaluate_speech_clarity(transcript, words_data):
 
     Formula: C1 = (C1.1 × 0.30) + (C1.2 × 0.25) + (C1.3 × 0.25) + (C1.4 × 0.20)
 
+    Args:
+        gaps: Optional precomputed _word_gaps(words_data), shared across criteria
+
     Returns:
         dict with 'score' (0-100), 'subcriteria', 'details'
     """
-    if not words_data or len(words_data) == 0:
+    if not words_data or not _has_timing(words_data):
         return {
             'score': 70,
             'subcriteria': {
@@ -420,167 +625,137 @@ def evaluate_speech_clarity(transcript, words_data):
             'details': {'note': 'No timing data available'}
         }
 
+    if gaps is None:
+        gaps = _word_gaps(words_data)
+
+    # Per-word statistics for C1.1, C1.3 and C1.4 gathered in a single pass
+    confidence_total = 0.0
+    confidence_count = 0
+    total_speech = 0.0
+    word_starts = []
+    for w in words_data:
+        if 'confidence' in w:
+            confidence_total += w['confidence']
+            confidence_count += 1
+        start = w['start_time']
+        total_speech += w['end_time'] - start
+        word_starts.append(start)
+
+    # Recording span from the first onset to the last offset, shared by C1.3 and C1.4
+    start_time = words_data[0]['start_time']
+    duration = words_data[-1]['end_time'] - start_time
+
     # ===== C1.1: OVERALL INTELLIGIBILITY (30%) =====
     # FACT Spec 2.3: STT confidence is a CEILING, not a penalty
     # "Low confidence does NOT directly lower the score. It only prevents unrealistic inflation."
-    try:
-        confidences = [w.get('confidence', 0.75) for w in words_data if 'confidence' in w]
-        if confidences:
-            avg_confidence = sum(confidences) / len(confidences)
-        else:
-            avg_confidence = 0.75
-
-        # Base intelligibility score: If STT produced a transcription, speech was intelligible
-        # Start with high base score (successful transcription = message understood)
-        base_intelligibility = 95
-
-        # Apply ceiling based on STT confidence (spec section 2.3)
-        # This CAPS the score, it doesn't SET it
-        if avg_confidence >= 0.85:
-            ceiling = 100  # No cap applied
-        elif avg_confidence >= 0.75:
-            ceiling = 90   # Maximum 90 per spec
-        elif avg_confidence >= 0.65:
-            ceiling = 80   # Maximum 80 per spec
-        else:
-            ceiling = 70   # Maximum 70 per spec
+    avg_confidence = confidence_total / confidence_count if confidence_count else 0.75
+
+    # Base intelligibility score: If STT produced a transcription, speech was intelligible
+    # Start with high base score (successful transcription = message understood)
+    base_intelligibility = 95
+
+    # Apply ceiling based on STT confidence (spec section 2.3)
+    # This CAPS the score, it doesn't SET it
+    ceiling = CONFIDENCE_CEILINGS[bisect.bisect_right(CONFIDENCE_CEILING_THRESHOLDS, avg_confidence)]
 
-        # Apply ceiling to base score
-        c1_1_intelligibility = min(base_intelligibility, ceiling)
-    except (KeyError, IndexError, TypeError, ZeroDivisionError) as e:
-        logger.warning(f"Error calculating intelligibility: {e}")
-        avg_confidence = 0.75
-        c1_1_intelligibility = 90  # Default to ceiling for 0.75 confidence
+    # Apply ceiling to base score
+    c1_1_intelligibility = min(base_intelligibility, ceiling)
 
     # ===== C1.2: THOUGHT GROUPING (25%) =====
     # Thinking pauses (between ideas) vs disruptive pauses (within phrases)
     # Per spec: "Thinking Pause: No penalty"
-    try:
-        thinking_pauses = 0
-        disruptive_pauses = 0
-
-        for i in range(len(words_data) - 1):
-            gap = words_data[i+1]['start_time'] - words_data[i]['end_time']
-
-            if gap >= 1.2:  # Pause threshold from spec
-                current_word = words_data[i]['word'].lower()
-                next_word = words_data[i+1]['word'].lower()
-
-                # Expanded thinking pause markers: sentence boundaries and discourse markers
-                # Natural speech includes pauses after connectors and before new ideas
-                thinking_markers = ['.', '!', '?', ',', 'y', 'o',
-                                   'entonces', 'luego', 'finalmente', 'después',
-                                   'además', 'pero', 'sin embargo', 'porque',
-                                   'bueno', 'pues', 'este', 'así', 'que',
-                                   'primero', 'segundo', 'también', 'ahora']
-
-                is_thinking_pause = any(marker in current_word for marker in thinking_markers)
+    # Single pass over the gaps also counts C1.3 micro-pauses (0.3-1.2s) within phrases
+    thinking_pauses = 0
+    disruptive_pauses = 0
+    micro_pauses = 0
+
+    for i, gap in enumerate(gaps):
+        if gap >= 1.2:  # Pause threshold from spec
+            current_word = words_data[i]['word'].lower()
+
+            is_thinking_pause = (
+                current_word.endswith(THINKING_PUNCTUATION) or
+                current_word.rstrip('.!?,;:') in THINKING_WORDS
+            )
 
-                if is_thinking_pause:
-                    thinking_pauses += 1
-                else:
-                    disruptive_pauses += 1
-
-        # Score based on spec section 2.4 - adjusted for natural speech
-        # Native speakers naturally pause; only penalize truly disruptive patterns
-        if disruptive_pauses == 0:
-            c1_2_thought_grouping = 95
-        elif disruptive_pauses <= 2:
-            c1_2_thought_grouping = 90
-        elif disruptive_pauses <= 4:
-            c1_2_thought_grouping = 80
-        elif disruptive_pauses <= 6:
-            c1_2_thought_grouping = 70
-        else:
-            c1_2_thought_grouping = 60
-    except (KeyError, IndexError, TypeError) as e:
-        logger.warning(f"Error calculating thought grouping: {e}")
-        thinking_pauses = 0
-        disruptive_pauses = 0
+            if is_thinking_pause:
+                thinking_pauses += 1
+            else:
+                disruptive_pauses += 1
+        elif gap >= 0.3:
+            micro_pauses += 1
+
+    # Score based on spec section 2.4 - adjusted for natural speech
+    # Native speakers naturally pause; only penalize truly disruptive patterns
+    if disruptive_pauses == 0:
+        c1_2_thought_grouping = 95
+    elif disruptive_pauses <= 2:
+        c1_2_thought_grouping = 90
+    elif disruptive_pauses <= 4:
         c1_2_thought_grouping = 80
+    elif disruptive_pauses <= 6:
+        c1_2_thought_grouping = 70
+    else:
+        c1_2_thought_grouping = 60
 
     # ===== C1.3: FLOW CONTINUITY (25%) =====
     # Sustained forward movement without unnecessary interruptions
     # Spec Section 2.5: Measures smooth, connected speech
-    try:
-        # Calculate total speech time vs total elapsed time
-        if len(words_data) >= 2:
-            total_elapsed = words_data[-1]['end_time'] - words_data[0]['start_time']
-            total_speech = sum([w['end_time'] - w['start_time'] for w in words_data])
-
-            speech_ratio = total_speech / total_elapsed if total_elapsed > 0 else 0
-
-            # Count micro-pauses (0.3-1.2s) within phrases
-            micro_pauses = 0
-            for i in range(len(words_data) - 1):
-                gap = words_data[i+1]['start_time'] - words_data[i]['end_time']
-                if 0.3 <= gap < 1.2:
-                    micro_pauses += 1
-
-            # Score based on spec section 2.5 - adjusted for natural speech patterns
-            # Natural spontaneous speech has more pauses than read speech
-            if speech_ratio >= 0.65 and micro_pauses <= 4:
-                c1_3_flow_continuity = 95  # Smooth, connected speech
-            elif speech_ratio >= 0.55 and micro_pauses <= 6:
-                c1_3_flow_continuity = 85  # Occasional interruptions (high end)
-            elif speech_ratio >= 0.45 and micro_pauses <= 8:
-                c1_3_flow_continuity = 75  # Occasional interruptions (low end)
-            elif speech_ratio >= 0.35:
-                c1_3_flow_continuity = 65  # Frequent fragmentation
-            else:
-                c1_3_flow_continuity = 55  # Severe breakdown
+    # Calculate total speech time vs total elapsed time
+    if len(words_data) >= 2:
+        speech_ratio = total_speech / duration if duration > 0 else 0
+
+        # Score based on spec section 2.5 - adjusted for natural speech patterns
+        # Natural spontaneous speech has more pauses than read speech
+        if speech_ratio >= 0.65 and micro_pauses <= 4:
+            c1_3_flow_continuity = 95  # Smooth, connected speech
+        elif speech_ratio >= 0.55 and micro_pauses <= 6:
+            c1_3_flow_continuity = 85  # Occasional interruptions (high end)
+        elif speech_ratio >= 0.45 and micro_pauses <= 8:
+            c1_3_flow_continuity = 75  # Occasional interruptions (low end)
+        elif speech_ratio >= 0.35:
+            c1_3_flow_continuity = 65  # Frequent fragmentation
         else:
-            c1_3_flow_continuity = 80
-            speech_ratio = 0
-            micro_pauses = 0
-    except (KeyError, IndexError, TypeError, ZeroDivisionError) as e:
-        logger.warning(f"Error calculating flow continuity: {e}")
+            c1_3_flow_continuity = 55  # Severe breakdown
+    else:
         c1_3_flow_continuity = 80
         speech_ratio = 0
-        micro_pauses = 0
 
     # ===== C1.4: STABILITY OVER TIME (20%) =====
     # Consistent speaking rate (WPS standard deviation)
-    try:
-        duration = words_data[-1]['end_time'] - words_data[0]['start_time']
-        if duration > 3:
-            window_wps = []
-            window_size = 3.0
-            start_time = words_data[0]['start_time']
-
-            for i in range(int(duration // window_size)):
-                window_start = start_time + i * window_size
-                window_end = window_start + window_size
-                words_in_window = [
-                    w for w in words_data
-                    if window_start <= w['start_time'] < window_end
-                ]
-                if words_in_window:
-                    wps = len(words_in_window) / window_size
-                    window_wps.append(wps)
-
-            if len(window_wps) > 1:
-                wps_std_dev = statistics.stdev(window_wps)
-
-                # Score based on spec section 2.6 - adjusted for natural speech
-                # Natural speech varies in pace; strict thresholds penalize spontaneity
-                if wps_std_dev <= 0.40:
-                    c1_4_stability = 95  # Stable rhythm (90-100 range)
-                elif wps_std_dev <= 0.70:
-                    c1_4_stability = 85  # Natural variation (75-89 range)
-                elif wps_std_dev <= 1.0:
-                    c1_4_stability = 70  # Irregular rhythm (60-74 range)
-                else:
-                    c1_4_stability = 55  # Collapsed rhythm (<60 range)
+    if duration > 3:
+        window_wps = []
+        window_size = 3.0
+        # Sorted word onsets: each window count is two binary searches instead of a full scan
+        word_starts.sort()
+
+        for i in range(int(duration // window_size)):
+            window_start = start_time + i * window_size
+            window_end = window_start + window_size
+            words_in_window = (bisect.bisect_left(word_starts, window_end) -
+                               bisect.bisect_left(word_starts, window_start))
+            if words_in_window:
+                wps = words_in_window / window_size
+                window_wps.append(wps)
+
+        if len(window_wps) > 1:
+            wps_std_dev = statistics.stdev(window_wps)
+
+            # Score based on spec section 2.6 - adjusted for natural speech
+            # Natural speech varies in pace; strict thresholds penalize spontaneity
+            if wps_std_dev <= 0.40:
+                c1_4_stability = 95  # Stable rhythm (90-100 range)
+            elif wps_std_dev <= 0.70:
+                c1_4_stability = 85  # Natural variation (75-89 range)
+            elif wps_std_dev <= 1.0:
+                c1_4_stability = 70  # Irregular rhythm (60-74 range)
             else:
-                c1_4_stability = 85  # Assume stable if not enough data
-                wps_std_dev = 0
+                c1_4_stability = 55  # Collapsed rhythm (<60 range)
         else:
-            c1_4_stability = 85  # Assume stable for short recordings
+            c1_4_stability = 85  # Assume stable if not enough data
             wps_std_dev = 0
-    except (KeyError, IndexError, TypeError, ZeroDivisionError, statistics.StatisticsError) as e:
-        logger.warning(f"Error calculating stability: {e}")
-        c1_4_stability = 75
+    else:
+        c1_4_stability = 85  # Assume stable for short recordings
         wps_std_dev = 0
 
     # ===== CALCULATE C1 FINAL SCORE =====
@@ -603,23 +778,113 @@ def evaluate_speech_clarity(transcript, words_data):
     return {
         'score': round(c1_final_score, 1),
         'subcriteria': {
-            'c1_1_intelligibility': round(c1_1_intelligibility, 1),
-            'c1_2_thought_grouping': round(c1_2_thought_grouping, 1),
-            'c1_3_flow_continuity': round(c1_3_flow_continuity, 1),
-            'c1_4_stability': round(c1_4_stability, 1)
+            'c1_1_intelligibility': c1_1_intelligibility,
+            'c1_2_thought_grouping': c1_2_thought_grouping,
+            'c1_3_flow_continuity': c1_3_flow_continuity,
+            'c1_4_stability': c1_4_stability
         },
         'details': {
             'stt_confidence': round(avg_confidence, 3),
             'thinking_pauses': thinking_pauses,
             'disruptive_pauses': disruptive_pauses,
             'speech_ratio': round(speech_ratio, 2) if speech_ratio else 0,
-            'micro_pauses': micro_pauses if 'micro_pauses' in locals() else 0,
+            'micro_pauses': micro_pauses,
             'wps_std_dev': round(wps_std_dev, 2) if wps_std_dev else 0
         }
     }
 
 
-def evaluate_communicative_function(transcript, level='intermediate'):
+# ===== GRAMMATICAL STRUCTURE PATTERNS (Spec Section 3.5) =====
+# Compiled once at import; evaluate_communicative_function counts matches per structure
+STRUCTURE_PATTERNS = {
+    # Present tense ser/estar (identification, location, states)
+    'presente_ser_estar': re.compile(
+        r'\b(soy|eres|es|somos|son|estoy|estás|está|estamos|están)\b'
+    ),
+    # Present tense regular verbs (habitual actions)
+    'presente_regular': re.compile(
+        r'\b(hablo|hablas|habla|hablamos|hablan|como|comes|come|comemos|comen|vivo|vives|vive|vivimos|viven|trabajo|trabajas|trabaja|trabajamos|trabajan|estudio|estudias|estudia|estudiamos|estudian)\b'
+    ),
+    # Possessive adjectives (possession)
+    'posesivos': re.compile(
+        r'\b(mi|mis|tu|tus|su|sus|nuestro|nuestra|nuestros|nuestras)\b'
+    ),
+    # Tener (possession/age)
+    'tener': re.compile(
+        r'\b(tengo|tienes|tiene|tenemos|tienen)\b'
+    ),
+    # Ir a + infinitive (future intention)
+    'ir_a': re.compile(
+        r'\b(voy a|vas a|va a|vamos a|van a)\b'
+    ),
+    # Estar + gerund (present progressive)
+    'estar_gerundio': re.compile(
+        r'\b(estoy|estás|está|estamos|están)\s+\w+(ando|iendo)\b'
+    ),
+    # Gustar (preferences)
+    'gustar': re.compile(
+        r'\b(me gusta|me gustan|te gusta|te gustan|le gusta|le gustan|nos gusta|nos gustan)\b'
+    ),
+    # Preterite (completed actions in past)
+    'preterite': re.compile(
+        r'\b(fui|fue|fueron|hice|hizo|hicieron|comí|comió|comieron|hablé|habló|hablaron|trabajé|trabajó|trabajaron|desperté|despertó|despertaron|regresé|regresó|regresaron)\b'
+    ),
+    # Imperfect (descriptions/habitual past)
+    'imperfect': re.compile(
+        r'\b(era|eras|éramos|eran|estaba|estabas|estábamos|estaban|tenía|tenías|teníamos|tenían|iba|ibas|íbamos|iban|hacía|hacías|hacíamos|hacían)\b'
+    ),
+    # Reflexive verbs (daily routine)
+    'reflexive': re.compile(
+        r'\b(me|te|se|nos)\s+(despert[oóé]|ducho|duchó|visto|vistió|llamo|llamó|siento|sintió)\b'
+    ),
+    # Subjunctive (emotion/influence/doubt at advanced)
+    'subjunctive': re.compile(
+        r'\b(sea|seas|seamos|sean|esté|estés|estemos|estén|tenga|tengas|tengamos|tengan|haya|hayas|hayamos|hayan|pueda|puedas|podamos|puedan|quiera|quieras|queramos|quieran|es importante que|me preocupa que|espero que|no creo que|para que|ojalá)\b'
+    ),
+    # Conditional (hypothetical)
+    'conditional': re.compile(
+        r'\b(sería|serías|seríamos|serían|haría|harías|haríamos|harían|tendría|tendrías|tendríamos|tendrían|podría|podrías|podríamos|podrían|debería|deberías|deberíamos|deberían)\b'
+    ),
+    # Commands/imperatives (instructions)
+    'commands': re.compile(
+        r'\b(habla|hable|come|coma|escribe|escriba|ve|vaya|haz|haga|ten|tenga)\b'
+    ),
+    # Por vs para (purpose)
+    'por_para': re.compile(
+        r'\b(por|para)\b'
+    )
+}
+
+# Groups of structures whose matches never overlap within the group, each fused
+# into one alternation so a single sweep counts all of them (match.lastgroup
+# names the structure). Structures that share words ('es' in ser/estar and
+# 'es importante que', 'para' in por/para and 'para que', 'tenga' in commands
+# and the subjunctive, 'me desperté' and preterite 'desperté') go in different groups
+FUSED_STRUCTURE_GROUPS = (
+    ('presente_regular', 'posesivos', 'tener', 'ir_a', 'gustar', 'preterite',
+     'imperfect', 'subjunctive', 'conditional'),
+    ('presente_ser_estar', 'reflexive', 'commands', 'por_para')
+)
+FUSED_STRUCTURE_PATTERNS = tuple(
+    re.compile('|'.join(
+        f'(?P<{structure}>{STRUCTURE_PATTERNS[structure].pattern})' for structure in group
+    ))
+    for group in FUSED_STRUCTURE_GROUPS
+)
+
+# Remaining structures overlap with both groups (estar + gerund vs. ser/estar 'estoy')
+# and are counted separately
+UNFUSED_STRUCTURE_PATTERNS = tuple(
+    (structure, pattern) for structure, pattern in STRUCTURE_PATTERNS.items()
+    if not any(structure in group for group in FUSED_STRUCTURE_GROUPS)
+)
+
+# Opinion/evaluation phrases expected by the advanced prompt (C2.1)
+OPINION_PHRASE_PATTERN = re.compile(
+    r'\b(creo que|pienso que|considero que|me parece que|en mi opinión|es importante que|es necesario que|me preocupa que)\b'
+)
+
+def evaluate_communicative_function(transcript, level='intermediate', text_lower=None):
     """C2: Communicative Function (30% weight)
 
     FACT Spec Section 3: Measures what the speaker can DO with Spanish.
@@ -634,231 +899,161 @@ def evaluate_communicative_function(transcript, level='intermediate'):
 
     Formula: C2 = (C2.1 × 0.30) + (C2.2 × 0.30) + (C2.3 × 0.20) + (C2.4 × 0.20)
 
+    Args:
+        text_lower: Optional precomputed transcript.lower(), shared across criteria
+
     Returns:
         dict with 'score' (0-100), 'subcriteria', 'details'
     """
-    text_lower = transcript.lower()
-    structures_detected = {}
+    if text_lower is None:
+        text_lower = transcript.lower()
+    structures_detected = dict.fromkeys(STRUCTURE_PATTERNS, 0)
 
     # ===== DETECT GRAMMATICAL STRUCTURES (Evidence of Function) =====
     # Spec Section 3.5: Structures detected as signals of functional intent
 
-    # Present tense ser/estar (identification, location, states)
-    structures_detected['presente_ser_estar'] = len(re.findall(
-        r'\b(soy|eres|es|somos|son|estoy|estás|está|estamos|están)\b', text_lower
-    ))
-
-    # Present tense regular verbs (habitual actions)
-    structures_detected['presente_regular'] = len(re.findall(
-        r'\b(hablo|hablas|habla|hablamos|hablan|como|comes|come|comemos|comen|vivo|vives|vive|vivimos|viven|trabajo|trabajas|trabaja|trabajamos|trabajan|estudio|estudias|estudia|estudiamos|estudian)\b',
-        text_lower
-    ))
-
-    # Possessive adjectives (possession)
-    structures_detected['posesivos'] = len(re.findall(
-        r'\b(mi|mis|tu|tus|su|sus|nuestro|nuestra|nuestros|nuestras)\b', text_lower
-    ))
-
-    # Tener (possession/age)
-    structures_detected['tener'] = len(re.findall(
-        r'\b(tengo|tienes|tiene|tenemos|tienen)\b', text_lower
-    ))
-
-    # Ir a + infinitive (future intention)
-    structures_detected['ir_a'] = len(re.findall(
-        r'\b(voy a|vas a|va a|vamos a|van a)\b', text_lower
-    ))
-
-    # Estar + gerund (present progressive)
-    structures_detected['estar_gerundio'] = len(re.findall(
-        r'\b(estoy|estás|está|estamos|están)\s+\w+(ando|iendo)\b', text_lower
-    ))
-
-    # Gustar (preferences)
-    structures_detected['gustar'] = len(re.findall(
-        r'\b(me gusta|me gustan|te gusta|te gustan|le gusta|le gustan|nos gusta|nos gustan)\b',
-        text_lower
-    ))
-
-    # Preterite (completed actions in past)
-    structures_detected['preterite'] = len(re.findall(
-        r'\b(fui|fue|fueron|hice|hizo|hicieron|comí|comió|comieron|hablé|habló|hablaron|trabajé|trabajó|trabajaron|desperté|despertó|despertaron|regresé|regresó|regresaron)\b',
-        text_lower
-    ))
-
-    # Imperfect (descriptions/habitual past)
-    structures_detected['imperfect'] = len(re.findall(
-        r'\b(era|eras|éramos|eran|estaba|estabas|estábamos|estaban|tenía|tenías|teníamos|tenían|iba|ibas|íbamos|iban|hacía|hacías|hacíamos|hacían)\b',
-        text_lower
-    ))
-
-    # Reflexive verbs (daily routine)
-    structures_detected['reflexive'] = len(re.findall(
-        r'\b(me|te|se|nos)\s+(despert[oóé]|ducho|duchó|visto|vistió|llamo|llamó|siento|sintió)\b',
-        text_lower
-    ))
-
-    # Subjunctive (emotion/influence/doubt at advanced)
-    structures_detected['subjunctive'] = len(re.findall(
-        r'\b(sea|seas|seamos|sean|esté|estés|estemos|estén|tenga|tengas|tengamos|tengan|haya|hayas|hayamos|hayan|pueda|puedas|podamos|puedan|quiera|quieras|queramos|quieran|es importante que|me preocupa que|espero que|no creo que|para que|ojalá)\b',
-        text_lower
-    ))
-
-    # Conditional (hypothetical)
-    structures_detected['conditional'] = len(re.findall(
-        r'\b(sería|serías|seríamos|serían|haría|harías|haríamos|harían|tendría|tendrías|tendríamos|tendrían|podría|podrías|podríamos|podrían|debería|deberías|deberíamos|deberían)\b',
-        text_lower
-    ))
-
-    # Commands/imperatives (instructions)
-    structures_detected['commands'] = len(re.findall(
-        r'\b(habla|hable|come|coma|escribe|escriba|ve|vaya|haz|haga|ten|tenga)\b',
-        text_lower
-    ))
+    for fused_pattern in FUSED_STRUCTURE_PATTERNS:
+        for match in fused_pattern.finditer(text_lower):
+            structures_detected[match.lastgroup] += 1
 
-    # Por vs para (purpose)
-    structures_detected['por_para'] = len(re.findall(
-        r'\b(por|para)\b', text_lower
-    ))
+    for structure, pattern in UNFUSED_STRUCTURE_PATTERNS:
+        structures_detected[structure] = len(pattern.findall(text_lower))
 
     # ===== GATING: MINIMUM STRUCTURE REQUIREMENT =====
     # ACTFL principle: "No puedes evaluar lo que no existe"
     # If no grammatical structures detected, cannot evaluate communicative function
     total_structures_detected = sum(structures_detected.values())
-    function_gating_active = total_structures_detected == 0
+
+    if total_structures_detected == 0:
+        # Gating: No structures detected, so every subcriterion takes its gated score
+        return {
+            'score': 35.0,
+            'subcriteria': {
+                'c2_1_task_fulfillment': 35,
+                'c2_2_functional_control': 35,
+                'c2_3_function_range': 35,
+                'c2_4_meaning_precision': 35
+            },
+            'details': {
+                'structures_detected': structures_detected,
+                'function_types_used': 0,
+                'structure_density': 0
+            }
+        }
 
     # ===== C2.1: TASK FULFILLMENT (30%) =====
     # Does the speaker address the prompt purpose?
     c2_1_task_fulfillment = 50
 
-    if function_gating_active:
-        # Gating: No structures detected, cannot fulfill task
-        c2_1_task_fulfillment = 35
-    else:
-        if level == 'beginner':
-            # Beginner prompt: "Introduce Yourself" - expect personal info
-            personal_info_markers = structures_detected['presente_ser_estar'] + structures_detected['tener']
-            if personal_info_markers >= 3:
-                c2_1_task_fulfillment = 90
-            elif personal_info_markers >= 2:
-                c2_1_task_fulfillment = 75
-            elif personal_info_markers >= 1:
-                c2_1_task_fulfillment = 60
+    if level == 'beginner':
+        # Beginner prompt: "Introduce Yourself" - expect personal info
+        personal_info_markers = structures_detected['presente_ser_estar'] + structures_detected['tener']
+        if personal_info_markers >= 3:
+            c2_1_task_fulfillment = 90
+        elif personal_info_markers >= 2:
+            c2_1_task_fulfillment = 75
+        elif personal_info_markers >= 1:
+            c2_1_task_fulfillment = 60
 
-        elif level == 'intermediate':
-            # Intermediate prompt: "Describe Your Day" - expect past narration
-            past_markers = structures_detected['preterite'] + structures_detected['imperfect']
-            if past_markers >= 5:
-                c2_1_task_fulfillment = 90
-            elif past_markers >= 3:
-                c2_1_task_fulfillment = 75
-            elif past_markers >= 1:
-                c2_1_task_fulfillment = 60
+    elif level == 'intermediate':
+        # Intermediate prompt: "Describe Your Day" - expect past narration
+        past_markers = structures_detected['preterite'] + structures_detected['imperfect']
+        if past_markers >= 5:
+            c2_1_task_fulfillment = 90
+        elif past_markers >= 3:
+            c2_1_task_fulfillment = 75
+        elif past_markers >= 1:
+            c2_1_task_fulfillment = 60
 
-        elif level == 'advanced':
-            # Advanced prompt: "Technology and Education" - expect opinion/evaluation
-            evaluative_markers = structures_detected['subjunctive'] + structures_detected['conditional']
-            has_opinion_phrases = bool(re.search(
-                r'\b(creo que|pienso que|considero que|me parece que|en mi opinión|es importante que|es necesario que|me preocupa que)\b',
-                text_lower
-            ))
-            if has_opinion_phrases and evaluative_markers >= 2:
-                c2_1_task_fulfillment = 95
-            elif has_opinion_phrases and evaluative_markers >= 1:
-                c2_1_task_fulfillment = 85
-            elif has_opinion_phrases:
-                c2_1_task_fulfillment = 70
+    elif level == 'advanced':
+        # Advanced prompt: "Technology and Education" - expect opinion/evaluation
+        evaluative_markers = structures_detected['subjunctive'] + structures_detected['conditional']
+        has_opinion_phrases = OPINION_PHRASE_PATTERN.search(text_lower) is not None
+        if has_opinion_phrases and evaluative_markers >= 2:
+            c2_1_task_fulfillment = 95
+        elif has_opinion_phrases and evaluative_markers >= 1:
+            c2_1_task_fulfillment = 85
+        elif has_opinion_phrases:
+            c2_1_task_fulfillment = 70
 
     # ===== C2.2: FUNCTIONAL CONTROL (30%) =====
     # Sustained use of intended communicative function
     c2_2_functional_control = 50
 
-    if function_gating_active:
-        # Gating: No structures detected, cannot demonstrate control
-        c2_2_functional_control = 35
-    else:
-        if level == 'beginner':
-            # Control over present tense description
-            total_present = structures_detected['presente_ser_estar'] + structures_detected['presente_regular']
-            if total_present >= 5:
-                c2_2_functional_control = 90
-            elif total_present >= 3:
-                c2_2_functional_control = 75
-            elif total_present >= 2:
-                c2_2_functional_control = 60
+    if level == 'beginner':
+        # Control over present tense description
+        total_present = structures_detected['presente_ser_estar'] + structures_detected['presente_regular']
+        if total_present >= 5:
+            c2_2_functional_control = 90
+        elif total_present >= 3:
+            c2_2_functional_control = 75
+        elif total_present >= 2:
+            c2_2_functional_control = 60
 
-        elif level == 'intermediate':
-            # Control over narration (preterite + imperfect coordination)
-            has_both = structures_detected['preterite'] >= 2 and structures_detected['imperfect'] >= 1
-            total_past = structures_detected['preterite'] + structures_detected['imperfect']
-            if has_both and total_past >= 6:
-                c2_2_functional_control = 95
-            elif total_past >= 4:
-                c2_2_functional_control = 80
-            elif total_past >= 2:
-                c2_2_functional_control = 65
+    elif level == 'intermediate':
+        # Control over narration (preterite + imperfect coordination)
+        has_both = structures_detected['preterite'] >= 2 and structures_detected['imperfect'] >= 1
+        total_past = structures_detected['preterite'] + structures_detected['imperfect']
+        if has_both and total_past >= 6:
+            c2_2_functional_control = 95
+        elif total_past >= 4:
+            c2_2_functional_control = 80
+        elif total_past >= 2:
+            c2_2_functional_control = 65
 
-        elif level == 'advanced':
-            # Control over argumentation (subjunctive + connectors + evaluative language)
-            has_subjunctive = structures_detected['subjunctive'] >= 2
-            has_conditional = structures_detected['conditional'] >= 1
-            complex_structures = has_subjunctive or has_conditional
-            if complex_structures:
-                c2_2_functional_control = 85
-            else:
-                c2_2_functional_control = 65
+    elif level == 'advanced':
+        # Control over argumentation (subjunctive + connectors + evaluative language)
+        has_subjunctive = structures_detected['subjunctive'] >= 2
+        has_conditional = structures_detected['conditional'] >= 1
+        complex_structures = has_subjunctive or has_conditional
+        if complex_structures:
+            c2_2_functional_control = 85
+        else:
+            c2_2_functional_control = 65
 
     # ===== C2.3: FUNCTION RANGE (20%) =====
     # Breadth of communicative actions demonstrated
     c2_3_function_range = 50
 
-    if function_gating_active:
-        # Gating: No structures detected, cannot demonstrate range
-        c2_3_function_range = 35
-    else:
-        # Count distinct function types used
-        function_types_used = 0
-        if structures_detected['presente_ser_estar'] >= 1: function_types_used += 1
-        if structures_detected['preterite'] >= 1: function_types_used += 1
-        if structures_detected['imperfect'] >= 1: function_types_used += 1
-        if structures_detected['ir_a'] >= 1: function_types_used += 1
-        if structures_detected['gustar'] >= 1: function_types_used += 1
-        if structures_detected['subjunctive'] >= 1: function_types_used += 1
-        if structures_detected['conditional'] >= 1: function_types_used += 1
-        if structures_detected['reflexive'] >= 1: function_types_used += 1
-
-        # Score based on variety
-        if function_types_used >= 5:
-            c2_3_function_range = 95
-        elif function_types_used >= 4:
-            c2_3_function_range = 85
-        elif function_types_used >= 3:
-            c2_3_function_range = 75
-        elif function_types_used >= 2:
-            c2_3_function_range = 65
+    # Count distinct function types used
+    function_types_used = 0
+    if structures_detected['presente_ser_estar'] >= 1: function_types_used += 1
+    if structures_detected['preterite'] >= 1: function_types_used += 1
+    if structures_detected['imperfect'] >= 1: function_types_used += 1
+    if structures_detected['ir_a'] >= 1: function_types_used += 1
+    if structures_detected['gustar'] >= 1: function_types_used += 1
+    if structures_detected['subjunctive'] >= 1: function_types_used += 1
+    if structures_detected['conditional'] >= 1: function_types_used += 1
+    if structures_detected['reflexive'] >= 1: function_types_used += 1
+
+    # Score based on variety
+    if function_types_used >= 5:
+        c2_3_function_range = 95
+    elif function_types_used >= 4:
+        c2_3_function_range = 85
+    elif function_types_used >= 3:
+        c2_3_function_range = 75
+    elif function_types_used >= 2:
+        c2_3_function_range = 65
 
     # ===== C2.4: MEANING PRECISION (20%) =====
     # Intended meaning conveyed without confusion
     c2_4_meaning_precision = 50
 
-    if function_gating_active:
-        # Gating: No structures detected, cannot demonstrate precision
-        c2_4_meaning_precision = 35
+    # Check for coherent use of structures (not random)
+    # Higher precision = consistent tense use, appropriate modality
+    word_count = len(transcript.split())
+    structure_density = total_structures_detected / max(word_count, 1)
+
+    # Good precision: 0.2-0.4 structures per word (coherent functional language)
+    if 0.2 <= structure_density <= 0.4:
+        c2_4_meaning_precision = 90
+    elif 0.15 <= structure_density <= 0.5:
+        c2_4_meaning_precision = 80
+    elif 0.10 <= structure_density:
+        c2_4_meaning_precision = 70
     else:
-        # Check for coherent use of structures (not random)
-        # Higher precision = consistent tense use, appropriate modality
-        word_count = len(transcript.split())
-        structure_density = sum(structures_detected.values()) / max(word_count, 1)
-
-        # Good precision: 0.2-0.4 structures per word (coherent functional language)
-        if 0.2 <= structure_density <= 0.4:
-            c2_4_meaning_precision = 90
-        elif 0.15 <= structure_density <= 0.5:
-            c2_4_meaning_precision = 80
-        elif 0.10 <= structure_density:
-            c2_4_meaning_precision = 70
-        else:
-            c2_4_meaning_precision = 60
+        c2_4_meaning_precision = 60
 
     # ===== CALCULATE C2 FINAL SCORE =====
     c2_final_score = (c2_1_task_fulfillment * 0.30 +
@@ -869,20 +1064,110 @@ def evaluate_communicative_function(transcript, level='intermediate'):
     return {
         'score': round(c2_final_score, 1),
         'subcriteria': {
-            'c2_1_task_fulfillment': round(c2_1_task_fulfillment, 1),
-            'c2_2_functional_control': round(c2_2_functional_control, 1),
-            'c2_3_function_range': round(c2_3_function_range, 1),
-            'c2_4_meaning_precision': round(c2_4_meaning_precision, 1)
+            'c2_1_task_fulfillment': c2_1_task_fulfillment,
+            'c2_2_functional_control': c2_2_functional_control,
+            'c2_3_function_range': c2_3_function_range,
+            'c2_4_meaning_precision': c2_4_meaning_precision
         },
         'details': {
             'structures_detected': structures_detected,
-            'function_types_used': function_types_used if 'function_types_used' in locals() else 0,
-            'structure_density': round(structure_density, 3) if 'structure_density' in locals() else 0
+            'function_types_used': function_types_used,
+            'structure_density': round(structure_density, 3)
         }
     }
 
 
-def evaluate_discourse_organization(transcript, words_data=None):
+# Punctuation and other non-word characters stripped from transcript tokens
+NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+
+# ===== DISCOURSE CONNECTORS BY LEVEL (Spec Section 4.4) =====
+# Beginner connectors
+BEGINNER_CONNECTORS = {
+    'additive': ['y', 'también'],
+    'contrast': ['pero'],
+    'sequence': ['primero', 'después', 'luego'],
+    'temporal': ['ahora', 'hoy', 'mañana'],
+    'causal': ['porque']
+}
+
+# Intermediate connectors
+INTERMEDIATE_CONNECTORS = {
+    'temporal_sequence': ['primero', 'después', 'luego', 'entonces', 'más tarde', 'finalmente'],
+    'temporal_context': ['antes', 'mientras', 'durante', 'cuando'],
+    'frequency': ['siempre', 'nunca', 'a veces', 'generalmente'],
+    'comparison': ['más que', 'menos que', 'tan'],
+    'causal': ['porque', 'por eso', 'entonces']
+}
+
+# Advanced connectors
+ADVANCED_CONNECTORS = {
+    'causal': ['porque', 'por eso', 'debido a', 'ya que', 'puesto que'],
+    'purpose': ['para', 'para que', 'con el fin de'],
+    'consequence': ['por lo tanto', 'entonces', 'así que', 'en consecuencia'],
+    'concession': ['aunque', 'a pesar de', 'sin embargo'],
+    'contrast': ['sin embargo', 'no obstante', 'por el contrario', 'en cambio'],
+    'condition': ['si', 'en caso de', 'siempre que'],
+    'projection': ['en el futuro', 'más adelante', 'eventualmente']
+}
+
+
+def _merge_connector_types(*connector_levels):
+    """Combine per-level connector dicts by type without losing entries
+
+    Types shared between levels (e.g. 'causal', 'contrast') keep the union
+    of their connectors instead of the last level overwriting the others.
+    """
+    merged = {}
+    for level_connectors in connector_levels:
+        for conn_type, conn_list in level_connectors.items():
+            type_connectors = merged.setdefault(conn_type, [])
+            type_connectors.extend(c for c in conn_list if c not in type_connectors)
+    return merged
+
+
+# All connector types combined across levels
+CONNECTOR_TYPES = _merge_connector_types(BEGINNER_CONNECTORS, INTERMEDIATE_CONNECTORS, ADVANCED_CONNECTORS)
+
+
+def _index_connectors(connector_types):
+    """Map each distinct connector, as a tuple of its words, to every type it belongs to
+
+    'entonces' is a temporal_sequence, causal and consequence connector; the
+    index lets the transcript be scanned once per phrase instead of once per type.
+    """
+    index = {}
+    for conn_type, conn_list in connector_types.items():
+        for connector in conn_list:
+            index.setdefault(tuple(connector.split()), []).append(conn_type)
+    return index
+
+
+# Distinct connector word tuples -> connector types
+CONNECTOR_INDEX = _index_connectors(CONNECTOR_TYPES)
+
+# Connector lengths in words: the transcript n-gram sizes counted in C3
+CONNECTOR_NGRAM_SIZES = frozenset(len(connector) for connector in CONNECTOR_INDEX)
+
+# ===== DISCOURSE TYPE MARKERS (C3.4) =====
+NARRATIVE_MARKERS = frozenset({'ayer', 'primero', 'después', 'luego', 'entonces', 'finalmente', 'cuando'})
+ARGUMENTATIVE_MARKERS = frozenset({'creo que', 'pienso que', 'considero que', 'me parece', 'es importante',
+                                   'me preocupa', 'aunque', 'sin embargo', 'por lo tanto'})
+DESCRIPTIVE_MARKERS = frozenset({'es', 'está', 'tiene', 'hay', 'son'})
+
+
+def _count_markers_present(markers, token_set, padded_text):
+    """Count how many distinct markers occur as whole words in the transcript
+
+    Single-word markers are looked up in the token set; multi-word markers are
+    searched space-padded in the normalized text.
+    """
+    return sum(
+        1 for marker in markers
+        if (f' {marker} ' in padded_text if ' ' in marker else marker in token_set)
+    )
+
+
+def evaluate_discourse_organization(transcript, words_data=None, gaps=None, text_lower=None):
     """C3: Discourse Organization (20% weight)
 
     FACT Spec Section 4: Measures how ideas are structured and connected.
@@ -897,12 +1182,16 @@ def evaluate_discourse_organization(transcript, words_data=None):
 
     Formula: C3 = (C3.1 × 0.30) + (C3.2 × 0.30) + (C3.3 × 0.20) + (C3.4 × 0.20)
 
+    Args:
+        gaps: Optional precomputed _word_gaps(words_data), shared across criteria
+        text_lower: Optional precomputed transcript.lower(), shared across criteria
+
     Returns:
         dict with 'score' (0-100), 'subcriteria', 'details'
     """
-    text_lower = transcript.lower()
-    words = transcript.split()
-    word_count = len(words)
+    if text_lower is None:
+        text_lower = transcript.lower()
+    word_count = len(transcript.split())
 
     # ===== GATING: MINIMUM WORD COUNT FOR DISCOURSE EVALUATION =====
     # ACTFL principle: "No puedes evaluar lo que no existe"
@@ -910,47 +1199,26 @@ def evaluate_discourse_organization(transcript, words_data=None):
     discourse_gating_active = word_count < 12
 
     # ===== DETECT CONNECTORS BY TYPE (Spec Section 4.4) =====
-    # Beginner connectors
-    beginner_connectors = {
-        'additive': ['y', 'también'],
-        'contrast': ['pero'],
-        'sequence': ['primero', 'después', 'luego'],
-        'temporal': ['ahora', 'hoy', 'mañana'],
-        'causal': ['porque']
+    connector_counts = dict.fromkeys(CONNECTOR_TYPES, 0)
+
+    # Check all connector types (combined across levels)
+    tokens = NON_WORD_PATTERN.sub('', text_lower).split()
+    token_counts = Counter(tokens)
+    padded_text = f" {' '.join(tokens)} "
+
+    # Whole-word matches only, so 'y' no longer counts inside 'muy' or 'si' inside 'casi'.
+    # Counting token n-grams also counts back-to-back repeats ('por eso por eso')
+    ngram_counts = {
+        size: Counter(zip(*(tokens[offset:] for offset in range(size))))
+        for size in CONNECTOR_NGRAM_SIZES
     }
+    for connector, conn_types in CONNECTOR_INDEX.items():
+        count = ngram_counts[len(connector)][connector]
+        if count:
+            for conn_type in conn_types:
+                connector_counts[conn_type] += count
 
-    # Intermediate connectors
-    intermediate_connectors = {
-        'temporal_sequence': ['primero', 'después', 'luego', 'entonces', 'más tarde', 'finalmente'],
-        'temporal_context': ['antes', 'mientras', 'durante', 'cuando'],
-        'frequency': ['siempre', 'nunca', 'a veces', 'generalmente'],
-        'comparison': ['más que', 'menos que', 'tan'],
-        'causal': ['porque', 'por eso', 'entonces']
-    }
-
-    # Advanced connectors
-    advanced_connectors = {
-        'causal': ['porque', 'por eso', 'debido a', 'ya que', 'puesto que'],
-        'purpose': ['para', 'para que', 'con el fin de'],
-        'consequence': ['por lo tanto', 'entonces', 'así que', 'en consecuencia'],
-        'concession': ['aunque', 'a pesar de', 'sin embargo'],
-        'contrast': ['sin embargo', 'no obstante', 'por el contrario', 'en cambio'],
-        'condition': ['si', 'en caso de', 'siempre que'],
-        'projection': ['en el futuro', 'más adelante', 'eventualmente']
-    }
-
-    # Count connectors
-    connector_counts = {}
-    total_connectors = 0
-
-    # Check all connector types (combine all levels)
-    all_connectors = {**beginner_connectors, **intermediate_connectors, **advanced_connectors}
-    for conn_type, conn_list in all_connectors.items():
-        count = 0
-        for connector in conn_list:
-            count += text_lower.count(connector)
-        connector_counts[conn_type] = count
-        total_connectors += count
+    total_connectors = sum(connector_counts.values())
 
     connector_variety = sum(1 for count in connector_counts.values() if count > 0)
 
@@ -1005,12 +1273,16 @@ def evaluate_discourse_organization(transcript, words_data=None):
     if discourse_gating_active:
         # Gating: Too short to evaluate idea development
         c3_3_development = 30
+        functional_sentences = 0
+        avg_idea_length = 0
     else:
         # Count functional sentences (estimated by pause patterns or connectors)
-        if words_data and len(words_data) > 0:
+        if words_data and _has_timing(words_data):
+            if gaps is None:
+                gaps = _word_gaps(words_data)
+
             functional_sentences = 1
-            for i in range(len(words_data) - 1):
-                gap = words_data[i+1]['start_time'] - words_data[i]['end_time']
+            for gap in gaps:
                 if gap >= 1.5:  # Strategic pause threshold
                     functional_sentences += 1
         else:
@@ -1034,14 +1306,10 @@ def evaluate_discourse_organization(transcript, words_data=None):
     c3_4_discourse_type = 50
 
     # Detect discourse type based on markers
-    narrative_markers = ['ayer', 'primero', 'después', 'luego', 'entonces', 'finalmente', 'cuando']
-    argumentative_markers = ['creo que', 'pienso que', 'considero que', 'me parece', 'es importante',
-                            'me preocupa', 'aunque', 'sin embargo', 'por lo tanto']
-    descriptive_markers = ['es', 'está', 'tiene', 'hay', 'son']
-
-    narrative_count = sum(1 for marker in narrative_markers if marker in text_lower)
-    argumentative_count = sum(1 for marker in argumentative_markers if marker in text_lower)
-    descriptive_count = sum(1 for marker in descriptive_markers if marker in text_lower)
+    token_set = token_counts.keys()
+    narrative_count = _count_markers_present(NARRATIVE_MARKERS, token_set, padded_text)
+    argumentative_count = _count_markers_present(ARGUMENTATIVE_MARKERS, token_set, padded_text)
+    descriptive_count = _count_markers_present(DESCRIPTIVE_MARKERS, token_set, padded_text)
 
     # Determine discourse type
     if argumentative_count >= 3:
@@ -1066,24 +1334,70 @@ def evaluate_discourse_organization(transcript, words_data=None):
     return {
         'score': round(c3_final_score, 1),
         'subcriteria': {
-            'c3_1_logical_sequencing': round(c3_1_logical_sequencing, 1),
-            'c3_2_cohesion': round(c3_2_cohesion, 1),
-            'c3_3_development': round(c3_3_development, 1),
-            'c3_4_discourse_type': round(c3_4_discourse_type, 1)
+            'c3_1_logical_sequencing': c3_1_logical_sequencing,
+            'c3_2_cohesion': c3_2_cohesion,
+            'c3_3_development': c3_3_development,
+            'c3_4_discourse_type': c3_4_discourse_type
         },
         'details': {
             'word_count': word_count,
             'total_connectors': total_connectors,
             'connector_variety': connector_variety,
-            'functional_sentences': functional_sentences if 'functional_sentences' in locals() else 0,
-            'avg_idea_length': round(avg_idea_length, 1) if 'avg_idea_length' in locals() else 0,
-            'discourse_type': discourse_type if 'discourse_type' in locals() else 'unknown',
+            'functional_sentences': functional_sentences,
+            'avg_idea_length': round(avg_idea_length, 1),
+            'discourse_type': discourse_type,
             'connector_counts': connector_counts
         }
     }
 
 
-def evaluate_lexical_use(transcript, level='intermediate'):
+# Function words excluded from the C4.3 lexical variety ratio
+LEXICAL_FUNCTION_WORDS = frozenset({
+    'el', 'la', 'los', 'las', 'un', 'una', 'de', 'del', 'a', 'al',
+    'en', 'con', 'por', 'para', 'que', 'y', 'o', 'pero', 'es', 'son', 'está', 'están'
+})
+
+# ===== EXPECTED VOCABULARY BY LEVEL (Spec Section 5.4) =====
+# Beginner Level Vocabulary
+BEGINNER_VOCAB = {
+    'identity': ['nombre', 'edad', 'nacionalidad', 'origen', 'llamo', 'años', 'soy'],
+    'occupations': ['estudiante', 'profesor', 'trabajo', 'médico', 'estudio'],
+    'languages': ['español', 'inglés', 'idioma', 'hablo', 'aprendiendo'],
+    'family': ['familia', 'padre', 'madre', 'hermano', 'hijo', 'hermanos'],
+    'hobbies': ['leer', 'cocinar', 'deportes', 'música', 'viajar', 'gusta'],
+    'time': ['día', 'hora', 'mañana', 'tarde', 'noche']
+}
+
+# Intermediate Level Vocabulary
+INTERMEDIATE_VOCAB = {
+    'shopping': ['comprar', 'vender', 'precio', 'mercado', 'tienda', 'compré'],
+    'daily_routine': ['despertar', 'desayunar', 'duchar', 'vestir', 'desperté', 'desayuné'],
+    'food': ['comida', 'desayuno', 'almuerzo', 'cena', 'cocinar', 'café'],
+    'health': ['salud', 'médico', 'enfermo', 'dolor', 'síntomas', 'dolía'],
+    'past_activities': ['ayer', 'fui', 'hice', 'dije', 'comí', 'hablé', 'regresé'],
+    'experiences': ['viaje', 'experiencia', 'evento', 'celebración', 'fue', 'sentía']
+}
+
+# Advanced Level Vocabulary
+ADVANCED_VOCAB = {
+    'technology': ['tecnología', 'digital', 'plataforma', 'herramienta', 'plataformas', 'digitales'],
+    'education': ['educación', 'estudiante', 'aprendizaje', 'enseñanza', 'estudiantes', 'aprender'],
+    'abstract_concepts': ['desarrollo', 'cambio', 'importancia', 'necesidad', 'importante', 'necesario'],
+    'evaluation': ['beneficio', 'problema', 'desafío', 'ventaja', 'preocupa', 'parece'],
+    'opinion_markers': ['creo', 'pienso', 'considero', 'opinión', 'perspectiva'],
+    'emotion': ['preocupa', 'alegra', 'molesta', 'importa', 'emociona'],
+    'future_projection': ['futuro', 'debería', 'podría', 'será', 'cambiar', 'híbrida']
+}
+
+# Flattened keyword lists per level; a keyword listed under two categories counts twice
+LEVEL_KEYWORDS = {
+    'beginner': tuple(keyword for keywords in BEGINNER_VOCAB.values() for keyword in keywords),
+    'intermediate': tuple(keyword for keywords in INTERMEDIATE_VOCAB.values() for keyword in keywords),
+    'advanced': tuple(keyword for keywords in ADVANCED_VOCAB.values() for keyword in keywords)
+}
+
+
+def evaluate_lexical_use(transcript, level='intermediate', text_lower=None):
     """C4: Lexical Use (25% weight)
 
     FACT Spec Section 5: Measures how effectively vocabulary serves the communicative message.
@@ -1098,11 +1412,15 @@ def evaluate_lexical_use(transcript, level='intermediate'):
 
     Formula: C4 = (C4.1 × 0.30) + (C4.2 × 0.30) + (C4.3 × 0.20) + (C4.4 × 0.20)
 
+    Args:
+        text_lower: Optional precomputed transcript.lower(), shared across criteria
+
     Returns:
         dict with 'score' (0-100), 'subcriteria', 'details'
     """
-    text_lower = transcript.lower()
-    words = transcript.lower().split()
+    if text_lower is None:
+        text_lower = transcript.lower()
+    words = text_lower.split()
 
     if not words:
         return {
@@ -1116,58 +1434,15 @@ def evaluate_lexical_use(transcript, level='intermediate'):
             'details': {}
         }
 
-    # ===== EXPECTED VOCABULARY BY LEVEL (Spec Section 5.4) =====
-    # Beginner Level Vocabulary
-    beginner_vocab = {
-        'identity': ['nombre', 'edad', 'nacionalidad', 'origen', 'llamo', 'años', 'soy'],
-        'occupations': ['estudiante', 'profesor', 'trabajo', 'médico', 'estudio'],
-        'languages': ['español', 'inglés', 'idioma', 'hablo', 'aprendiendo'],
-        'family': ['familia', 'padre', 'madre', 'hermano', 'hijo', 'hermanos'],
-        'hobbies': ['leer', 'cocinar', 'deportes', 'música', 'viajar', 'gusta'],
-        'time': ['día', 'hora', 'mañana', 'tarde', 'noche']
-    }
-
-    # Intermediate Level Vocabulary
-    intermediate_vocab = {
-        'shopping': ['comprar', 'vender', 'precio', 'mercado', 'tienda', 'compré'],
-        'daily_routine': ['despertar', 'desayunar', 'duchar', 'vestir', 'desperté', 'desayuné'],
-        'food': ['comida', 'desayuno', 'almuerzo', 'cena', 'cocinar', 'café'],
-        'health': ['salud', 'médico', 'enfermo', 'dolor', 'síntomas', 'dolía'],
-        'past_activities': ['ayer', 'fui', 'hice', 'dije', 'comí', 'hablé', 'regresé'],
-        'experiences': ['viaje', 'experiencia', 'evento', 'celebración', 'fue', 'sentía']
-    }
-
-    # Advanced Level Vocabulary
-    advanced_vocab = {
-        'technology': ['tecnología', 'digital', 'plataforma', 'herramienta', 'plataformas', 'digitales'],
-        'education': ['educación', 'estudiante', 'aprendizaje', 'enseñanza', 'estudiantes', 'aprender'],
-        'abstract_concepts': ['desarrollo', 'cambio', 'importancia', 'necesidad', 'importante', 'necesario'],
-        'evaluation': ['beneficio', 'problema', 'desafío', 'ventaja', 'preocupa', 'parece'],
-        'opinion_markers': ['creo', 'pienso', 'considero', 'opinión', 'perspectiva'],
-        'emotion': ['preocupa', 'alegra', 'molesta', 'importa', 'emociona'],
-        'future_projection': ['futuro', 'debería', 'podría', 'será', 'cambiar', 'híbrida']
-    }
-
     # ===== COUNT TOPIC-ALIGNED KEYWORDS BY LEVEL =====
-    topic_keywords_found = 0
-
-    if level == 'beginner':
-        for category, keywords in beginner_vocab.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    topic_keywords_found += 1
-
-    elif level == 'intermediate':
-        for category, keywords in intermediate_vocab.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    topic_keywords_found += 1
-
-    elif level == 'advanced':
-        for category, keywords in advanced_vocab.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    topic_keywords_found += 1
+    # Whole-token matches, so 'hora' no longer matches inside 'ahora'
+    clean_words = NON_WORD_PATTERN.sub('', text_lower).split()
+    word_set = set(clean_words)
+    keywords_by_level = {
+        vocab_level: sum(1 for keyword in keywords if keyword in word_set)
+        for vocab_level, keywords in LEVEL_KEYWORDS.items()
+    }
+    topic_keywords_found = keywords_by_level.get(level, 0)
 
     # ===== GATING: MINIMUM WORD COUNT REQUIREMENT =====
     # ACTFL principle: "No puedes evaluar lo que no existe"
@@ -1234,16 +1509,16 @@ def evaluate_lexical_use(transcript, level='intermediate'):
         # Gating: Cannot measure variety with <10 words
         c4_3_lexical_variety = 0
         variety_ratio = 0
+        content_word_count = 0
+        unique_content_count = 0
     else:
         # Calculate variety ratio (unique words / total words)
-        clean_words = [re.sub(r'[^\w\s]', '', w) for w in words if w]
-        function_words = ['el', 'la', 'los', 'las', 'un', 'una', 'de', 'del', 'a', 'al',
-                         'en', 'con', 'por', 'para', 'que', 'y', 'o', 'pero', 'es', 'son', 'está', 'están']
-        content_words = [w for w in clean_words if w and w not in function_words]
+        content_words = [w for w in clean_words if w not in LEXICAL_FUNCTION_WORDS]
+        content_word_count = len(content_words)
+        unique_content_count = len(set(content_words))
 
-        if len(content_words) > 0:
-            unique_content = set(content_words)
-            variety_ratio = len(unique_content) / len(content_words)
+        if content_word_count > 0:
+            variety_ratio = unique_content_count / content_word_count
 
             if variety_ratio >= 0.75:
                 c4_3_lexical_variety = 95
@@ -1261,11 +1536,12 @@ def evaluate_lexical_use(transcript, level='intermediate'):
     # ===== C4.4: CONCEPTUAL LEVEL (20%) =====
     # Vocabulary appropriate to task complexity
     c4_4_conceptual_level = 50
+    thematic_level = 'unknown'
 
     # Detect thematic level based on vocabulary used
-    personal_count = sum(1 for cat in beginner_vocab.values() for w in cat if w in text_lower)
-    everyday_count = sum(1 for cat in intermediate_vocab.values() for w in cat if w in text_lower)
-    abstract_count = sum(1 for cat in advanced_vocab.values() for w in cat if w in text_lower)
+    personal_count = keywords_by_level['beginner']
+    everyday_count = keywords_by_level['intermediate']
+    abstract_count = keywords_by_level['advanced']
 
     # Score based on level-appropriate conceptual complexity
     if level == 'beginner':
@@ -1316,21 +1592,60 @@ def evaluate_lexical_use(transcript, level='intermediate'):
     return {
         'score': round(c4_final_score, 1),
         'subcriteria': {
-            'c4_1_lexical_fit': round(c4_1_lexical_fit, 1),
-            'c4_2_lexical_sufficiency': round(c4_2_lexical_sufficiency, 1),
-            'c4_3_lexical_variety': round(c4_3_lexical_variety, 1),
-            'c4_4_conceptual_level': round(c4_4_conceptual_level, 1)
+            'c4_1_lexical_fit': c4_1_lexical_fit,
+            'c4_2_lexical_sufficiency': c4_2_lexical_sufficiency,
+            'c4_3_lexical_variety': c4_3_lexical_variety,
+            'c4_4_conceptual_level': c4_4_conceptual_level
         },
         'details': {
             'topic_keywords_found': topic_keywords_found,
-            'variety_ratio': round(variety_ratio, 2) if 'variety_ratio' in locals() else 0,
-            'unique_content_words': len(set(content_words)) if content_words else 0,
-            'total_content_words': len(content_words) if content_words else 0,
-            'thematic_level': thematic_level if 'thematic_level' in locals() else 'unknown'
+            'variety_ratio': round(variety_ratio, 2),
+            'unique_content_words': unique_content_count,
+            'total_content_words': content_word_count,
+            'thematic_level': thematic_level
         }
     }
 
 
+# Number of distinct (transcript, timing, level) criterion evaluations kept in memory
+FACT_CRITERIA_CACHE_SIZE = 256
+
+# Word fields carried in the hashable cache key, in key tuple order
+WORD_KEY_FIELDS = ('word', 'start_time', 'end_time', 'confidence')
+
+@lru_cache(maxsize=FACT_CRITERIA_CACHE_SIZE)
+def _evaluate_fact_criteria(transcript, words_key, level):
+    """Run the four FACT criterion evaluators for a hashable transcription
+
+    The evaluators are deterministic, so repeated scoring of the same recording
+    (retried uploads hit the transcription cache) reuses the result. Feedback
+    text is not cached because improvement suggestions are chosen at random.
+
+    Args:
+        transcript: Transcribed text
+        words_key: tuple of (word, start_time, end_time, confidence) tuples,
+            with None for fields the word did not have
+        level: Expected level (beginner/intermediate/advanced)
+
+    Returns:
+        tuple: (c1, c2, c3, c4) criterion result dicts, shared between calls
+    """
+    # Missing fields stay missing, so the evaluators' optional-field handling still applies
+    words_data = [
+        {field: value for field, value in zip(WORD_KEY_FIELDS, word_values) if value is not None}
+        for word_values in words_key
+    ]
+
+    gaps = _word_gaps(words_data) if _has_timing(words_data) else None
+    text_lower = transcript.lower()
+
+    return (
+        evaluate_speech_clarity(transcript, words_data, gaps=gaps),
+        evaluate_communicative_function(transcript, level=level, text_lower=text_lower),
+        evaluate_discourse_organization(transcript, words_data=words_data, gaps=gaps, text_lower=text_lower),
+        evaluate_lexical_use(transcript, level=level, text_lower=text_lower)
+    )
+
 def actfl_fact_assessment(transcription_data, level='intermediate', prompt_type='free_speech'):
     """Main FACT Speech Evaluation System Assessment
 
@@ -1367,10 +1682,13 @@ def actfl_fact_assessment(transcription_data, level='intermediate', prompt_type=
         }
 
     # ===== EVALUATE EACH CRITERION =====
-    c1_speech_clarity = evaluate_speech_clarity(transcript, words_data)
-    c2_communicative_function = evaluate_communicative_function(transcript, level=level)
-    c3_discourse_organization = evaluate_discourse_organization(transcript, words_data=words_data)
-    c4_lexical_use = evaluate_lexical_use(transcript, level=level)
+    # Results are memoized and shared: they are only read here, and the
+    # subcriteria (flat) and details (nested) handed back to the caller are copied below
+    words_key = tuple(
+        tuple(w.get(field) for field in WORD_KEY_FIELDS) for w in words_data
+    )
+    (c1_speech_clarity, c2_communicative_function,
+     c3_discourse_organization, c4_lexical_use) = _evaluate_fact_criteria(transcript, words_key, level)
 
     # ===== CALCULATE WEIGHTED FINAL SCORE (Spec Section 7.3) =====
     raw_score = (
@@ -1433,16 +1751,16 @@ def actfl_fact_assessment(transcription_data, level='intermediate', prompt_type=
             'lexical_use': c4_lexical_use['score']
         },
         'subcriteria_breakdown': {
-            'c1_subcriteria': c1_speech_clarity.get('subcriteria', {}),
-            'c2_subcriteria': c2_communicative_function.get('subcriteria', {}),
-            'c3_subcriteria': c3_discourse_organization.get('subcriteria', {}),
-            'c4_subcriteria': c4_lexical_use.get('subcriteria', {})
+            'c1_subcriteria': dict(c1_speech_clarity.get('subcriteria', {})),
+            'c2_subcriteria': dict(c2_communicative_function.get('subcriteria', {})),
+            'c3_subcriteria': dict(c3_discourse_organization.get('subcriteria', {})),
+            'c4_subcriteria': dict(c4_lexical_use.get('subcriteria', {}))
         },
         'details': {
-            'c1_details': c1_speech_clarity.get('details', {}),
-            'c2_details': c2_communicative_function.get('details', {}),
-            'c3_details': c3_discourse_organization.get('details', {}),
-            'c4_details': c4_lexical_use.get('details', {})
+            'c1_details': copy.deepcopy(c1_speech_clarity.get('details', {})),
+            'c2_details': copy.deepcopy(c2_communicative_function.get('details', {})),
+            'c3_details': copy.deepcopy(c3_discourse_organization.get('details', {})),
+            'c4_details': copy.deepcopy(c4_lexical_use.get('details', {}))
         }
     }
 
@@ -1464,6 +1782,19 @@ def _generate_score_explanation(score):
         return "Your attempt shows effort. With practice in clarity and organization, your communication will strengthen."
 
 
+# Strength messages for C2, C3 and C4 as (minimum score, message) bands, highest first
+STRENGTH_BANDS = (
+    # Communicative Function
+    ((85, "Your communicative goal is clear and well-executed."),
+     (75, "You successfully accomplish what you set out to communicate.")),
+    # Discourse Organization
+    ((80, "Your ideas follow a logical order."),
+     (70, "You connect your thoughts effectively.")),
+    # Lexical Use
+    ((80, "Your vocabulary supports your message well."),
+     (70, "You use words that clearly express your ideas."))
+)
+
 def _generate_strengths(score, c1, c2, c3, c4, level):
     """Generate strengths list (Spec Section 9.2)
 
@@ -1490,23 +1821,12 @@ def _generate_strengths(score, c1, c2, c3, c4, level):
     elif c1['score'] >= 70:
         strengths.append("You maintain steady rhythm throughout your message.")
 
-    # Communicative Function strengths
-    if c2['score'] >= 85:
-        strengths.append("Your communicative goal is clear and well-executed.")
-    elif c2['score'] >= 75:
-        strengths.append("You successfully accomplish what you set out to communicate.")
-
-    # Discourse Organization strengths
-    if c3['score'] >= 80:
-        strengths.append("Your ideas follow a logical order.")
-    elif c3['score'] >= 70:
-        strengths.append("You connect your thoughts effectively.")
-
-    # Lexical Use strengths
-    if c4['score'] >= 80:
-        strengths.append("Your vocabulary supports your message well.")
-    elif c4['score'] >= 70:
-        strengths.append("You use words that clearly express your ideas.")
+    # Communicative Function, Discourse Organization and Lexical Use strengths
+    for criterion, bands in zip((c2, c3, c4), STRENGTH_BANDS):
+        for minimum_score, strength in bands:
+            if criterion['score'] >= minimum_score:
+                strengths.append(strength)
+                break
 
     # Ensure at least 1 strength (Spec Rule 1)
     if not strengths:
@@ -1516,6 +1836,193 @@ def _generate_strengths(score, c1, c2, c3, c4, level):
     return strengths[:3]
 
 
+# Score-based feedback pools for each criterion, keyed by criterion then score range
+IMPROVEMENT_FEEDBACK = {
+    'c1': {  # Speech Clarity (Pronunciation, Rhythm, Flow)
+        (0, 20): [
+            "Work on recognizing and producing the most common sounds in Spanish. Your ears will get better at hearing the differences with practice.",
+            "Try recording yourself saying individual words and comparing them to native speakers. Small steps build confidence!",
+            "Focus on pronouncing vowel sounds clearly and consistently. Spanish vowels are your building blocks!"
+        ],
+        (21, 40): [
+            "Practice linking short, familiar phrases together. Even simple combinations help build fluency.",
+            "Try to maintain a steady pace when speaking, even if it's slow. Rhythm matters more than speed right now.",
+            "Record yourself and listen back. Notice where you pause or hesitate, then practice those spots."
+        ],
+        (41, 54): [
+            "You're making real progress! Now work on smoothing the transitions between words you already know.",
+            "Pay attention to where native speakers pause for breath. Try to group your words into natural chunks instead of word-by-word.",
+            "Practice asking and answering simple questions. This builds both vocabulary and confidence."
+        ],
+        (55, 64): [
+            "Work on maintaining consistent stress patterns within words. Spanish has predictable stress rules that will help you sound more natural.",
+            "Try shadowing (repeating immediately after) short audio clips from native speakers to improve your rhythm and intonation.",
+            "Focus on connecting simple sentences smoothly. The flow between sentences is just as important as individual words."
+        ],
+        (65, 74): [
+            "Practice using connectors like 'porque' (because), 'cuando' (when), and 'después' (after) to make your speech flow better.",
+            "Focus on controlling your rhythm so it's steady throughout your message, not just in individual words.",
+            "Pay attention to linking words together smoothly. In natural Spanish, words often flow into each other."
+        ],
+        (75, 84): [
+            "Work on reducing repetition and filler words while maintaining natural speech flow.",
+            "Pay attention to intonation patterns that convey emotion or emphasis, not just basic statement vs. question.",
+            "Practice varying your sentence structure for more engaging speech."
+        ],
+        (85, 94): [
+            "Refine subtle aspects of pronunciation like prosody (speech melody) that convey attitude and emotion.",
+            "Work on controlling your speech rate strategically—slowing for emphasis, speeding for less important details.",
+            "Pay attention to regional variations in pronunciation and choose which standard you want to model most closely."
+        ],
+        (95, 100): [
+            "Focus on the most subtle aspects of native-like pronunciation, such as regional intonation patterns and emotional coloring.",
+            "Explore literary and artistic uses of the language to deepen your appreciation of its full expressive potential.",
+            "Practice using sophisticated rhetorical devices like metaphor or parallel structure when appropriate."
+        ]
+    },
+    'c2': {  # Communicative Function (Grammar, Tenses, Structures)
+        (0, 20): [
+            "Focus on building your foundation with basic greetings and self-introductions. Practice saying simple phrases about yourself until they feel natural.",
+            "Start with memorizing a few key phrases you use every day. Repetition is your friend at this stage!",
+            "Practice simple present tense verbs for daily activities. Mastering 'yo soy' and 'yo tengo' is a great start."
+        ],
+        (21, 40): [
+            "Practice forming simple complete sentences using subject-verb-object order.",
+            "Work on using the present tense consistently when talking about your daily routine.",
+            "Try describing things around you using simple adjectives. This expands your vocabulary naturally."
+        ],
+        (41, 54): [
+            "Practice expressing simple ideas in complete sentences, even if they're basic.",
+            "Work on using the present tense consistently to talk about your daily activities and preferences.",
+            "Try explaining simple processes (like making a sandwich) to practice using sequential language naturally."
+        ],
+        (55, 64): [
+            "Practice using the present tense consistently across different subjects (I, you, he/she, we, they).",
+            "Work on asking questions in addition to making statements. Questions help keep conversations flowing.",
+            "Try combining two simple sentences with 'y' (and) or 'pero' (but) for more natural speech."
+        ],
+        (65, 74): [
+            "Practice switching between present and past tense to tell simple stories about what you did yesterday.",
+            "Work on using common irregular verbs in the present tense until they become automatic.",
+            "Try expressing your opinions with 'Me gusta...' and 'Prefiero...' to add personality to your speech."
+        ],
+        (75, 84): [
+            "Practice narrating past events with consistent use of preterite and imperfect tenses. This will make your stories more engaging.",
+            "Work on using the future tense or 'ir a + infinitive' to talk about plans and predictions.",
+            "Try using the subjunctive mood after expressions of desire or doubt to add nuance to your communication."
+        ],
+        (85, 94): [
+            "Refine your ability to express abstract ideas and opinions with supporting details.",
+            "Practice using subjunctive mood consistently when expressing doubt, desire, or hypotheticals.",
+            "Work on constructing complex arguments with multiple supporting points and conclusions."
+        ],
+        (95, 100): [
+            "Continue refining your ability to discuss highly specialized or abstract topics with precision.",
+            "Practice constructing sophisticated arguments with counterarguments and nuanced positions.",
+            "Work on adapting your register (formal vs. informal) smoothly based on context and audience."
+        ]
+    },
+    'c3': {  # Discourse Organization (Connectors, Coherence, Structure)
+        (0, 20): [
+            "Practice saying simple phrases in a logical order, like 'Hello, my name is... I am from...'",
+            "Work on responding to basic questions with appropriate answers, even if they're very short.",
+            "Try memorizing short dialogues to understand how conversations flow naturally."
+        ],
+        (21, 40): [
+            "Practice putting your ideas in a clear order: first introduce yourself, then add details.",
+            "Work on using 'y' (and) to connect related ideas together.",
+            "Try answering 'why' questions with 'porque' (because) to show cause and effect."
+        ],
+        (41, 54): [
+            "Practice organizing your thoughts before speaking. Think: What do I want to say first, second, third?",
+            "Work on using time words like 'primero' (first), 'después' (after), and 'finalmente' (finally).",
+            "Try telling a short story with a beginning, middle, and end."
+        ],
+        (55, 64): [
+            "Practice using basic connectors like 'y' (and), 'pero' (but), 'porque' (because) to link your sentences.",
+            "Work on giving examples to support your main ideas using 'por ejemplo' (for example).",
+            "Try explaining your reasoning step-by-step rather than jumping between unrelated ideas."
+        ],
+        (65, 74): [
+            "Practice using a variety of connectors: 'porque', 'pero', 'entonces', 'también', 'sin embargo'.",
+            "Work on organizing longer responses with a clear beginning, middle, and end.",
+            "Try using transition phrases like 'por otro lado' (on the other hand) to show contrasts."
+        ],
+        (75, 84): [
+            "Practice using sophisticated connectors like 'sin embargo' (nevertheless), 'por lo tanto' (therefore) to show clearer relationships between ideas.",
+            "Work on signaling topic changes explicitly so listeners can follow your train of thought.",
+            "Try adding supporting details and examples to make your main points more convincing."
+        ],
+        (85, 94): [
+            "Practice incorporating more idiomatic expressions and culturally specific references naturally.",
+            "Work on using cohesion devices like pronouns and synonyms to avoid repetition while maintaining clarity.",
+            "Try structuring complex arguments with thesis, supporting evidence, and conclusion."
+        ],
+        (95, 100): [
+            "Continue exposing yourself to diverse registers and specialized discourse structures.",
+            "Practice tailoring your organizational patterns to different audiences and purposes.",
+            "Work on using rhetorical devices strategically to enhance your message's impact."
+        ]
+    },
+    'c4': {  # Lexical Use (Vocabulary Breadth and Precision)
+        (0, 20): [
+            "Build your vocabulary by learning 5 new common words each day. Start with things you see around you.",
+            "Practice the most frequent words in Spanish: numbers, colors, family members, and common objects.",
+            "Use flashcards or a vocabulary app to review new words regularly until they stick."
+        ],
+        (21, 40): [
+            "Practice using adjectives to describe nouns. Start simple: big/small, good/bad, new/old.",
+            "Work on learning vocabulary in categories: foods, places, activities. This makes it easier to remember.",
+            "Try labeling objects around your home with Spanish sticky notes to build everyday vocabulary."
+        ],
+        (41, 54): [
+            "Practice using verbs beyond 'ser' and 'estar'. Learn common action verbs for daily activities.",
+            "Work on building topic-specific vocabulary for things you talk about frequently.",
+            "Try using a Spanish-Spanish dictionary to learn new words through definitions rather than translations."
+        ],
+        (55, 64): [
+            "Practice expressing the same idea in different ways to avoid repeating the same words.",
+            "Work on learning synonyms for common words you use frequently to add variety.",
+            "Try reading simple Spanish texts and noting down new words with example sentences."
+        ],
+        (65, 74): [
+            "Practice using more specific vocabulary rather than general words. Instead of 'cosa', use the precise term.",
+            "Work on learning common idiomatic expressions that native speakers use naturally.",
+            "Try incorporating new vocabulary immediately after learning it, even if it feels awkward at first."
+        ],
+        (75, 84): [
+            "Practice using topic-specific vocabulary with precision rather than general approximations.",
+            "Work on distinguishing between similar words with subtle meaning differences.",
+            "Try learning word families (noun, verb, adjective forms) to expand vocabulary efficiently."
+        ],
+        (85, 94): [
+            "Refine your use of low-frequency but precise vocabulary for specialized topics.",
+            "Work on using collocations (word combinations) that native speakers use naturally.",
+            "Try incorporating more sophisticated vocabulary while maintaining clarity and appropriateness."
+        ],
+        (95, 100): [
+            "Continue expanding your vocabulary in specialized domains relevant to your interests.",
+            "Practice using vocabulary with complete awareness of register, connotation, and context.",
+            "Explore historical, regional, and stylistic variations in vocabulary use."
+        ]
+    }
+}
+
+# Improvement feedback score bands, sorted by upper bound so a band can be
+# found with a single bisect instead of an if/elif ladder
+IMPROVEMENT_SCORE_RANGES = (
+    (0, 20), (21, 40), (41, 54), (55, 64),
+    (65, 74), (75, 84), (85, 94), (95, 100)
+)
+_IMPROVEMENT_RANGE_UPPER_BOUNDS = tuple(upper for _, upper in IMPROVEMENT_SCORE_RANGES)
+
+
+def _get_score_range(score_val):
+    """Determine which improvement score range a value falls into"""
+    index = bisect.bisect_left(_IMPROVEMENT_RANGE_UPPER_BOUNDS, score_val)
+    return IMPROVEMENT_SCORE_RANGES[min(index, len(IMPROVEMENT_SCORE_RANGES) - 1)]
+
+
 def _generate_improvements(score, c1, c2, c3, c4, level):
     """Generate improvements list based on score ranges and lowest-scoring criteria
 
@@ -1529,197 +2036,6 @@ def _generate_improvements(score, c1, c2, c3, c4, level):
     Returns:
         List of 1-2 improvement strings
     """
-    # Score-based feedback pools for each criterion
-    IMPROVEMENT_FEEDBACK = {
-        'c1': {  # Speech Clarity (Pronunciation, Rhythm, Flow)
-            (0, 20): [
-                "Work on recognizing and producing the most common sounds in Spanish. Your ears will get better at hearing the differences with practice.",
-                "Try recording yourself saying individual words and comparing them to native speakers. Small steps build confidence!",
-                "Focus on pronouncing vowel sounds clearly and consistently. Spanish vowels are your building blocks!"
-            ],
-            (21, 40): [
-                "Practice linking short, familiar phrases together. Even simple combinations help build fluency.",
-                "Try to maintain a steady pace when speaking, even if it's slow. Rhythm matters more than speed right now.",
-                "Record yourself and listen back. Notice where you pause or hesitate, then practice those spots."
-            ],
-            (41, 54): [
-                "You're making real progress! Now work on smoothing the transitions between words you already know.",
-                "Pay attention to where native speakers pause for breath. Try to group your words into natural chunks instead of word-by-word.",
-                "Practice asking and answering simple questions. This builds both vocabulary and confidence."
-            ],
-            (55, 64): [
-                "Work on maintaining consistent stress patterns within words. Spanish has predictable stress rules that will help you sound more natural.",
-                "Try shadowing (repeating immediately after) short audio clips from native speakers to improve your rhythm and intonation.",
-                "Focus on connecting simple sentences smoothly. The flow between sentences is just as important as individual words."
-            ],
-            (65, 74): [
-                "Practice using connectors like 'porque' (because), 'cuando' (when), and 'después' (after) to make your speech flow better.",
-                "Focus on controlling your rhythm so it's steady throughout your message, not just in individual words.",
-                "Pay attention to linking words together smoothly. In natural Spanish, words often flow into each other."
-            ],
-            (75, 84): [
-                "Work on reducing repetition and filler words while maintaining natural speech flow.",
-                "Pay attention to intonation patterns that convey emotion or emphasis, not just basic statement vs. question.",
-                "Practice varying your sentence structure for more engaging speech."
-            ],
-            (85, 94): [
-                "Refine subtle aspects of pronunciation like prosody (speech melody) that convey attitude and emotion.",
-                "Work on controlling your speech rate strategically—slowing for emphasis, speeding for less important details.",
-                "Pay attention to regional variations in pronunciation and choose which standard you want to model most closely."
-            ],
-            (95, 100): [
-                "Focus on the most subtle aspects of native-like pronunciation, such as regional intonation patterns and emotional coloring.",
-                "Explore literary and artistic uses of the language to deepen your appreciation of its full expressive potential.",
-                "Practice using sophisticated rhetorical devices like metaphor or parallel structure when appropriate."
-            ]
-        },
-        'c2': {  # Communicative Function (Grammar, Tenses, Structures)
-            (0, 20): [
-                "Focus on building your foundation with basic greetings and self-introductions. Practice saying simple phrases about yourself until they feel natural.",
-                "Start with memorizing a few key phrases you use every day. Repetition is your friend at this stage!",
-                "Practice simple present tense verbs for daily activities. Mastering 'yo soy' and 'yo tengo' is a great start."
-            ],
-            (21, 40): [
-                "Practice forming simple complete sentences using subject-verb-object order.",
-                "Work on using the present tense consistently when talking about your daily routine.",
-                "Try describing things around you using simple adjectives. This expands your vocabulary naturally."
-            ],
-            (41, 54): [
-                "Practice expressing simple ideas in complete sentences, even if they're basic.",
-                "Work on using the present tense consistently to talk about your daily activities and preferences.",
-                "Try explaining simple processes (like making a sandwich) to practice using sequential language naturally."
-            ],
-            (55, 64): [
-                "Practice using the present tense consistently across different subjects (I, you, he/she, we, they).",
-                "Work on asking questions in addition to making statements. Questions help keep conversations flowing.",
-                "Try combining two simple sentences with 'y' (and) or 'pero' (but) for more natural speech."
-            ],
-            (65, 74): [
-                "Practice switching between present and past tense to tell simple stories about what you did yesterday.",
-                "Work on using common irregular verbs in the present tense until they become automatic.",
-                "Try expressing your opinions with 'Me gusta...' and 'Prefiero...' to add personality to your speech."
-            ],
-            (75, 84): [
-                "Practice narrating past events with consistent use of preterite and imperfect tenses. This will make your stories more engaging.",
-                "Work on using the future tense or 'ir a + infinitive' to talk about plans and predictions.",
-                "Try using the subjunctive mood after expressions of desire or doubt to add nuance to your communication."
-            ],
-            (85, 94): [
-                "Refine your ability to express abstract ideas and opinions with supporting details.",
-                "Practice using subjunctive mood consistently when expressing doubt, desire, or hypotheticals.",
-                "Work on constructing complex arguments with multiple supporting points and conclusions."
-            ],
-            (95, 100): [
-                "Continue refining your ability to discuss highly specialized or abstract topics with precision.",
-                "Practice constructing sophisticated arguments with counterarguments and nuanced positions.",
-                "Work on adapting your register (formal vs. informal) smoothly based on context and audience."
-            ]
-        },
-        'c3': {  # Discourse Organization (Connectors, Coherence, Structure)
-            (0, 20): [
-                "Practice saying simple phrases in a logical order, like 'Hello, my name is... I am from...'",
-                "Work on responding to basic questions with appropriate answers, even if they're very short.",
-                "Try memorizing short dialogues to understand how conversations flow naturally."
-            ],
-            (21, 40): [
-                "Practice putting your ideas in a clear order: first introduce yourself, then add details.",
-                "Work on using 'y' (and) to connect related ideas together.",
-                "Try answering 'why' questions with 'porque' (because) to show cause and effect."
-            ],
-            (41, 54): [
-                "Practice organizing your thoughts before speaking. Think: What do I want to say first, second, third?",
-                "Work on using time words like 'primero' (first), 'después' (after), and 'finalmente' (finally).",
-                "Try telling a short story with a beginning, middle, and end."
-            ],
-            (55, 64): [
-                "Practice using basic connectors like 'y' (and), 'pero' (but), 'porque' (because) to link your sentences.",
-                "Work on giving examples to support your main ideas using 'por ejemplo' (for example).",
-                "Try explaining your reasoning step-by-step rather than jumping between unrelated ideas."
-            ],
-            (65, 74): [
-                "Practice using a variety of connectors: 'porque', 'pero', 'entonces', 'también', 'sin embargo'.",
-                "Work on organizing longer responses with a clear beginning, middle, and end.",
-                "Try using transition phrases like 'por otro lado' (on the other hand) to show contrasts."
-            ],
-            (75, 84): [
-                "Practice using sophisticated connectors like 'sin embargo' (nevertheless), 'por lo tanto' (therefore) to show clearer relationships between ideas.",
-                "Work on signaling topic changes explicitly so listeners can follow your train of thought.",
-                "Try adding supporting details and examples to make your main points more convincing."
-            ],
-            (85, 94): [
-                "Practice incorporating more idiomatic expressions and culturally specific references naturally.",
-                "Work on using cohesion devices like pronouns and synonyms to avoid repetition while maintaining clarity.",
-                "Try structuring complex arguments with thesis, supporting evidence, and conclusion."
-            ],
-            (95, 100): [
-                "Continue exposing yourself to diverse registers and specialized discourse structures.",
-                "Practice tailoring your organizational patterns to different audiences and purposes.",
-                "Work on using rhetorical devices strategically to enhance your message's impact."
-            ]
-        },
-        'c4': {  # Lexical Use (Vocabulary Breadth and Precision)
-            (0, 20): [
-                "Build your vocabulary by learning 5 new common words each day. Start with things you see around you.",
-                "Practice the most frequent words in Spanish: numbers, colors, family members, and common objects.",
-                "Use flashcards or a vocabulary app to review new words regularly until they stick."
-            ],
-            (21, 40): [
-                "Practice using adjectives to describe nouns. Start simple: big/small, good/bad, new/old.",
-                "Work on learning vocabulary in categories: foods, places, activities. This makes it easier to remember.",
-                "Try labeling objects around your home with Spanish sticky notes to build everyday vocabulary."
-            ],
-            (41, 54): [
-                "Practice using verbs beyond 'ser' and 'estar'. Learn common action verbs for daily activities.",
-                "Work on building topic-specific vocabulary for things you talk about frequently.",
-                "Try using a Spanish-Spanish dictionary to learn new words through definitions rather than translations."
-            ],
-            (55, 64): [
-                "Practice expressing the same idea in different ways to avoid repeating the same words.",
-                "Work on learning synonyms for common words you use frequently to add variety.",
-                "Try reading simple Spanish texts and noting down new words with example sentences."
-            ],
-            (65, 74): [
-                "Practice using more specific vocabulary rather than general words. Instead of 'cosa', use the precise term.",
-                "Work on learning common idiomatic expressions that native speakers use naturally.",
-                "Try incorporating new vocabulary immediately after learning it, even if it feels awkward at first."
-            ],
-            (75, 84): [
-                "Practice using topic-specific vocabulary with precision rather than general approximations.",
-                "Work on distinguishing between similar words with subtle meaning differences.",
-                "Try learning word families (noun, verb, adjective forms) to expand vocabulary efficiently."
-            ],
-            (85, 94): [
-                "Refine your use of low-frequency but precise vocabulary for specialized topics.",
-                "Work on using collocations (word combinations) that native speakers use naturally.",
-                "Try incorporating more sophisticated vocabulary while maintaining clarity and appropriateness."
-            ],
-            (95, 100): [
-                "Continue expanding your vocabulary in specialized domains relevant to your interests.",
-                "Practice using vocabulary with complete awareness of register, connotation, and context.",
-                "Explore historical, regional, and stylistic variations in vocabulary use."
-            ]
-        }
-    }
-
-    def get_score_range(score_val):
-        """Determine which score range a value falls into"""
-        if score_val <= 20:
-            return (0, 20)
-        elif score_val <= 40:
-            return (21, 40)
-        elif score_val <= 54:
-            return (41, 54)
-        elif score_val <= 64:
-            return (55, 64)
-        elif score_val <= 74:
-            return (65, 74)
-        elif score_val <= 84:
-            return (75, 84)
-        elif score_val <= 94:
-            return (85, 94)
-        else:
-            return (95, 100)
-
     improvements = []
 
     # Identify lowest-scoring criteria
@@ -1733,14 +2049,13 @@ def _generate_improvements(score, c1, c2, c3, c4, level):
 
     # Generate improvements for 2 lowest criteria
     for criterion_name, criterion_score, criterion_data in criteria_scores[:2]:
-        score_range = get_score_range(criterion_score)
+        score_range = _get_score_range(criterion_score)
 
-        if criterion_name in IMPROVEMENT_FEEDBACK and score_range in IMPROVEMENT_FEEDBACK[criterion_name]:
-            feedback_options = IMPROVEMENT_FEEDBACK[criterion_name][score_range]
-            if feedback_options:
-                # Randomly select one feedback from the options for variety
-                selected_feedback = random.choice(feedback_options)
-                improvements.append(selected_feedback)
+        feedback_options = IMPROVEMENT_FEEDBACK.get(criterion_name, {}).get(score_range)
+        if feedback_options:
+            # Randomly select one feedback from the options for variety
+            selected_feedback = random.choice(feedback_options)
+            improvements.append(selected_feedback)
 
     # Fallback if somehow no improvements were generated
     if not improvements:
@@ -1765,6 +2080,30 @@ def assess_free_speech(transcription_data, level='intermediate'):
     """
     return actfl_fact_assessment(transcription_data, level=level, prompt_type='free_speech')
 
+# Prompt type associated with each practice reference level
+PRACTICE_PROMPT_TYPES = {
+    'short': 'introduce_yourself',
+    'medium': 'describe_your_day',
+    'extended': 'opinion_technology_education'
+}
+
+# Number of (transcript, reference) similarity scores kept in memory
+REFERENCE_SIMILARITY_CACHE_SIZE = 1024
+
+@lru_cache(maxsize=REFERENCE_SIMILARITY_CACHE_SIZE)
+def _reference_similarity(transcript, reference_level):
+    """Similarity (0-100) between a transcript and a practice reference phrase
+
+    Cached because learners repeat the same short reference phrases during practice.
+    """
+    # default_process lowercases and strips punctuation, matching fuzzywuzzy's
+    # full_process; the reference side is pre-processed at load time.
+    # rapidfuzz returns a float, kept as an integer percentage
+    return round(fuzz.token_sort_ratio(
+        utils.default_process(transcript),
+        PROCESSED_REFERENCES[reference_level]
+    ))
+
 def assess_practice_phrase(transcription_data, reference_level, level='intermediate'):
     """Evaluate practice phrase using FACT assessment + similarity bonus
 
@@ -1778,24 +2117,20 @@ def assess_practice_phrase(transcription_data, reference_level, level='intermedi
     """
     transcript = transcription_data.get('transcript', '')
 
-    if reference_level not in REFERENCES:
+    # Nothing to compare against the reference: skip the similarity scoring
+    if reference_level not in REFERENCES or not transcript:
         return actfl_fact_assessment(transcription_data, level=level, prompt_type='free_speech')
 
     reference_text = REFERENCES[reference_level]
 
     # Map reference level to prompt type for better alignment checking
-    prompt_type_map = {
-        'short': 'introduce_yourself',
-        'medium': 'describe_your_day',
-        'extended': 'opinion_technology_education'
-    }
-    prompt_type = prompt_type_map.get(reference_level, 'free_speech')
+    prompt_type = PRACTICE_PROMPT_TYPES.get(reference_level, 'free_speech')
 
     # Get base FACT assessment with appropriate prompt type
     base_assessment = actfl_fact_assessment(transcription_data, level=level, prompt_type=prompt_type)
 
     # Calculate similarity to reference phrase
-    similarity_score = fuzz.token_sort_ratio(transcript.lower(), reference_text.lower())
+    similarity_score = _reference_similarity(transcript, reference_level)
 
     # Small bonus for following the reference (max +10 points)
     similarity_bonus = (similarity_score - 70) * 0.2 if similarity_score > 70 else 0
@@ -1816,6 +2151,47 @@ def assess_practice_phrase(transcription_data, reference_level, level='intermedi
 
     return base_assessment
 
+# Maximum Gemini corrections in flight per worker process. Defaults to one per
+# gunicorn request thread, so corrections are only skipped when earlier calls
+# are still stuck on Gemini after their requests gave up waiting
+CORRECTION_MAX_IN_FLIGHT = int(os.environ.get(
+    'STRAWBERRY_CORRECTION_WORKERS', os.environ.get('GUNICORN_THREADS', 8)
+))
+
+# Background pool for Gemini corrections; created once so requests don't pay for thread startup
+CORRECTION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=CORRECTION_MAX_IN_FLIGHT,
+    thread_name_prefix='gemini-correction'
+)
+
+# One slot per correction worker; a slot is held until the Gemini call returns,
+# even after the request has stopped waiting for it
+_correction_slots = threading.BoundedSemaphore(CORRECTION_MAX_IN_FLIGHT)
+
+# Seconds to wait for the Gemini correction before answering with the transcript as-is
+CORRECTION_TIMEOUT = 10
+
+# Corrections skipped because every slot was held (count per worker process, for the logs)
+_skipped_corrections = itertools.count(1)
+
+def _submit_correction(transcribed_text):
+    """Start generate_corrected_text in the background
+
+    Returns None instead of queueing when every correction worker is busy, so a
+    backlog of slow Gemini calls fails fast rather than timing out in the queue.
+    """
+    if not _correction_slots.acquire(blocking=False):
+        logger.warning(f"All {CORRECTION_MAX_IN_FLIGHT} LLM correction slots are busy; "
+                       f"skipping correction ({next(_skipped_corrections)} skipped so far)")
+        return None
+    try:
+        future = CORRECTION_EXECUTOR.submit(generate_corrected_text, transcribed_text)
+    except Exception:
+        _correction_slots.release()
+        raise
+    future.add_done_callback(lambda _: _correction_slots.release())
+    return future
+
 def generate_corrected_text(transcribed_text):
     """
     Genera la versión gramaticalmente corregida del texto transcrito 
@@ -1828,8 +2204,8 @@ def generate_corrected_text(transcribed_text):
         return transcribed_text
 
     try:
-        # Inicializa el cliente (obtiene la clave API automáticamente del entorno)
-        client = Client()
+        # Reutiliza el cliente compartido (obtiene la clave API automáticamente del entorno)
+        client = get_gemini_client()
         
         # Instrucción de sistema para asegurar que el modelo solo corrija la gramática en español
         system_instruction = (
@@ -1862,20 +2238,54 @@ def generate_corrected_text(transcribed_text):
         logger.error(f"Error during LLM correction: {str(e)}")
         return transcribed_text
 
-def generate_tts_feedback(text, score):
+# Signed URLs for TTS audio in Cloud Storage stay valid for 2 hours
+TTS_URL_EXPIRATION = datetime.timedelta(hours=2)
+
+def _tts_signed_url(blob):
+    """Create a signed GET URL for a TTS blob"""
+    return blob.generate_signed_url(
+        version="v4",
+        expiration=TTS_URL_EXPIRATION,
+        method="GET"
+    )
+
+def _save_tts_locally(audio_content, filename):
+    """Write TTS audio to the local temp directory and return its serving URL"""
+    # Cleanup old files periodically
+    cleanup_old_tts_files()
+
+    # Write to a private temp file and rename into place, so a concurrent request
+    # for the same content never serves a partially written file
+    local_filepath = os.path.join(TTS_TEMP_DIR, filename)
+    fd, temp_path = tempfile.mkstemp(dir=TTS_TEMP_DIR, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(audio_content)
+        os.replace(temp_path, local_filepath)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    logger.info(f"TTS audio saved locally: {local_filepath}")
+    return url_for('get_tts_audio', filename=filename)
+
+def generate_tts_feedback(text, score, reuse_cached=False):
     """Generate Text-to-Speech audio feedback in Spanish
 
+    Audio is named by a digest of (speaking rate, text), so repeated phrases
+    such as practice references are synthesized once and then reused.
+
     Args:
         text: Text to convert to speech
         score: Assessment score (0-100) to determine speaking rate
+        reuse_cached: Check Cloud Storage for existing audio before synthesizing.
+            Only worth the extra request for texts that repeat (practice references)
 
     Returns:
         URL to TTS audio file
     """
     try:
-        # Initialize Text-to-Speech client
-        client = texttospeech.TextToSpeechClient()
-
         # Select voice based on score (slower for beginners)
         if score < 60:
             speaking_rate = 0.8  # Slow for beginners
@@ -1883,6 +2293,28 @@ def generate_tts_feedback(text, score):
             speaking_rate = 0.9  # Moderate for developing speakers
         else:
             speaking_rate = 1.0  # Normal for proficient speakers
+
+        # Content-addressed filename: same text at the same rate gives the same audio
+        tts_key = hashlib.blake2b(f"{speaking_rate}|{text}".encode('utf-8'), digest_size=16).hexdigest()
+        filename = f"tts_{tts_key}.mp3"
+        local_filepath = os.path.join(TTS_TEMP_DIR, filename)
+
+        # Reuse previously synthesized audio when available. The bucket is read
+        # once: another request may mark it unavailable meanwhile
+        current_bucket = bucket
+        if current_bucket:
+            blob = current_bucket.blob(f"tts/{filename}")
+            try:
+                if reuse_cached and blob.exists():
+                    logger.info(f"Reusing cached TTS audio: {filename}")
+                    return _tts_signed_url(blob)
+            except Exception as e:
+                logger.warning(f"Error checking cached TTS audio: {str(e)}")
+        elif os.path.exists(local_filepath):
+            # Refresh the modification time so cleanup treats the file as recent
+            os.utime(local_filepath)
+            logger.info(f"Reusing cached TTS audio: {local_filepath}")
+            return url_for('get_tts_audio', filename=filename)
         
         # Build the voice request
         synthesis_input = texttospeech.SynthesisInput(text=text)
@@ -1900,48 +2332,40 @@ def generate_tts_feedback(text, score):
         )
         
         # Perform the text-to-speech request
-        response = client.synthesize_speech(
+        response = tts_client.synthesize_speech(
             input=synthesis_input, voice=voice, audio_config=audio_config
         )
         
-        # Generate a unique filename
-        filename = f"tts_{uuid.uuid4()}.mp3"
-        
         # If we have a bucket, upload to Cloud Storage
-        if bucket:
+        if current_bucket:
             try:
-                blob = bucket.blob(f"tts/{filename}")
-                blob.upload_from_bytes(response.audio_content, content_type='audio/mpeg')
-                
-                # Create a signed URL that will be valid for 2 hours
-                url = blob.generate_signed_url(
-                    version="v4",
-                    expiration=datetime.timedelta(hours=2),
-                    method="GET"
+                # Single-shot upload from memory; if_generation_match=0 makes the
+                # create-only request safely retryable
+                blob.upload_from_file(
+                    io.BytesIO(response.audio_content),
+                    size=len(response.audio_content),
+                    content_type='audio/mpeg',
+                    if_generation_match=0
                 )
                 logger.info(f"TTS audio generated and uploaded: {filename}")
-                return url
+            except exceptions.PreconditionFailed:
+                # The same audio was already uploaded (earlier or concurrently): cache hit
+                logger.info(f"TTS audio already uploaded: {filename}")
+            except exceptions.NotFound as e:
+                # Missing bucket: serve this and later audio from the local directory
+                _mark_bucket_unavailable(e)
+                return _save_tts_locally(response.audio_content, filename)
             except Exception as e:
                 logger.error(f"Error uploading TTS audio to bucket: {str(e)}")
                 # Fallback to local storage if bucket upload fails
-                # Cleanup old files periodically
-                cleanup_old_tts_files()
-                local_filename = f"tts_{uuid.uuid4()}.mp3"
-                local_filepath = os.path.join(TTS_TEMP_DIR, local_filename)
-                with open(local_filepath, 'wb') as f:
-                    f.write(response.audio_content)
-                logger.info(f"TTS audio saved locally: {local_filepath}")
-                return url_for('get_tts_audio', filename=local_filename)
+                return _save_tts_locally(response.audio_content, filename)
+
+            _mark_bucket_verified()
+            # Create a signed URL that will be valid for 2 hours
+            return _tts_signed_url(blob)
         else:
             # Save to TTS temp directory
-            # Cleanup old files periodically
-            cleanup_old_tts_files()
-            local_filename = f"tts_{uuid.uuid4()}.mp3"
-            local_filepath = os.path.join(TTS_TEMP_DIR, local_filename)
-            with open(local_filepath, 'wb') as f:
-                f.write(response.audio_content)
-            logger.info(f"TTS audio saved locally: {local_filepath}")
-            return url_for('get_tts_audio', filename=local_filename)
+            return _save_tts_locally(response.audio_content, filename)
 
     except Exception as e:
         logger.error(f"Error generating TTS audio: {str(e)}")
@@ -1952,15 +2376,27 @@ def generate_tts_feedback(text, score):
 def home():
     return render_template('index.html')
 
-@app.route('/health')
-def health():
-    """Health check endpoint"""
-    bucket_status = "connected" if bucket else "not connected"
-    return jsonify({
+# Health payloads per bucket_status, serialized once. 'configured' means the
+# bucket has not been confirmed by Storage yet (no startup check without
+# STRAWBERRY_AUTO_CREATE_BUCKET), so a misconfigured bucket never reads as connected
+HEALTH_BUCKET_STATES = {
+    'verified': 'connected',
+    'unverified': 'configured',
+    'unavailable': 'not connected'
+}
+HEALTH_JSON = {
+    status: orjson.dumps({
         "status": "ok",
-        "bucket": bucket_status,
+        "bucket": bucket_state,
         "bucket_name": BUCKET_NAME
     })
+    for status, bucket_state in HEALTH_BUCKET_STATES.items()
+}
+
+@app.route('/health')
+def health():
+    """Health check endpoint"""
+    return Response(HEALTH_JSON[bucket_status], mimetype='application/json')
 
 @app.route('/process-audio', methods=['POST'])
 def process_audio():
@@ -1987,7 +2423,7 @@ def process_audio():
         user_level = request.form.get('level', 'intermediate')
 
         # Validate level parameter
-        if user_level not in ['beginner', 'intermediate', 'advanced']:
+        if user_level not in VALID_LEVELS:
             user_level = 'intermediate'
 
         # Extract tracking parameters
@@ -2025,15 +2461,31 @@ def process_audio():
             # Practice mode with reference phrase
             assessment = assess_practice_phrase(transcription_data, practice_level, level=user_level)
             corrected_text = REFERENCES[practice_level]  # Use reference as corrected text
+            # Reference phrases repeat across learners, so previously synthesized audio is reused
+            reuse_cached_tts = True
             logger.info(f"Practice mode assessment: level={user_level}, practice_level={practice_level}, score={assessment['score']}")
         else:
-            # Free speech mode
+            # Free speech mode: the LLM correction is independent of the
+            # assessment, so it runs in the background while we score
+            reuse_cached_tts = False
+            corrected_future = _submit_correction(spoken_text)
             assessment = assess_free_speech(transcription_data, level=user_level)
-            corrected_text = generate_corrected_text(spoken_text)
+            if corrected_future is None:
+                # Already logged and counted by _submit_correction
+                corrected_text = spoken_text
+            else:
+                try:
+                    corrected_text = corrected_future.result(timeout=CORRECTION_TIMEOUT)
+                except FutureTimeoutError:
+                    # Drops the call if it has not started; a running call keeps its
+                    # slot until Gemini answers, which is what bounds the backlog
+                    corrected_future.cancel()
+                    logger.warning(f"LLM correction exceeded {CORRECTION_TIMEOUT}s. Returning uncorrected text.")
+                    corrected_text = spoken_text
             logger.info(f"Free speech assessment: level={user_level}, score={assessment['score']}")
 
         # Generate TTS feedback (pass score for determining speaking rate)
-        tts_url = generate_tts_feedback(corrected_text, assessment['score'])
+        tts_url = generate_tts_feedback(corrected_text, assessment['score'], reuse_cached=reuse_cached_tts)
 
         # Prepare response (NO 'level' shown to user, only score and feedback)
         response = {
@@ -2094,7 +2546,7 @@ def get_tts_audio(filename):
         logger.warning(f"Invalid TTS filename requested: {filename}")
         return "Invalid filename", 400
 
-    # Only allow expected filename pattern (tts_<uuid>.mp3)
+    # Only allow expected filename pattern (tts_<digest>.mp3)
     if not filename.startswith('tts_') or not filename.endswith('.mp3'):
         logger.warning(f"Unexpected TTS filename format: {filename}")
         return "Invalid filename format", 400
@@ -2112,19 +2564,22 @@ def get_tts_audio(filename):
         logger.warning(f"Path traversal attempt detected: {filename}")
         return "Invalid path", 400
 
-    return send_file(file_path, mimetype='audio/mpeg')
+    # Files are content-addressed, so a name always maps to the same audio:
+    # let the learner's browser cache it and answer Range/If-None-Match requests
+    # with 206/304. The audio is learner-specific feedback, so shared caches must not store it
+    response = send_file(file_path, mimetype='audio/mpeg', conditional=True, max_age=TTS_FILE_MAX_AGE)
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
 
 @app.route('/references')
 def get_references():
     """Serves the reference phrases for practice"""
-    try:
-        return jsonify(REFERENCES)
-    except Exception as e:
-        logger.error(f"Error loading references: {e}")
-        return jsonify({
-            "error": "Could not load references",
-            "short": "Hola, ¿cómo estás?"
-        }), 500
+    return Response(
+        REFERENCES_JSON,
+        mimetype='application/json',
+        headers={'Cache-Control': 'public, max-age=3600'}
+    )
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the FACT criterion evaluators in app.py
+
+Pins the matching rules the evaluators rely on: whole-word connectors,
+keywords and discourse markers, thinking vs. disruptive pause classification,
+and fused structure counts equal to one findall per structure.
+"""
+
+from unittest import mock
+
+import pytest
+
+# app.py creates the Speech, Storage and Text-to-Speech clients at import, which
+# needs GCP credentials. The evaluators under test never call them, so the client
+# classes are replaced with mocks for the import; any other import error fails loudly
+speech = pytest.importorskip('google.cloud.speech')
+storage = pytest.importorskip('google.cloud.storage')
+texttospeech = pytest.importorskip('google.cloud.texttospeech')
+
+with mock.patch.object(speech, 'SpeechClient'), \
+        mock.patch.object(storage, 'Client'), \
+        mock.patch.object(texttospeech, 'TextToSpeechClient'):
+    import app
+
+
+def _words(*spec):
+    """Build words_data from (word, silence before the word in seconds) pairs"""
+    words_data = []
+    end_time = 0.0
+    for word, gap in spec:
+        start_time = end_time + gap
+        end_time = start_time + 0.4
+        words_data.append({'word': word, 'start_time': start_time, 'end_time': end_time, 'confidence': 0.9})
+    return words_data
+
+
+# ===== C1: SPEECH CLARITY =====
+
+def test_pause_after_marker_word_is_thinking():
+    """A long pause after a connector is a pause between ideas"""
+    words_data = _words(('voy', 0), ('y', 0.1), ('como', 1.5), ('pan', 0.1))
+    details = app.evaluate_speech_clarity('voy y como pan', words_data)['details']
+    assert details['thinking_pauses'] == 1
+    assert details['disruptive_pauses'] == 0
+
+
+def test_pause_after_word_containing_marker_is_disruptive():
+    """Markers match whole words only: 'como' contains 'o' but is not a marker"""
+    words_data = _words(('yo', 0), ('como', 0.1), ('pan', 1.5), ('hoy', 0.1))
+    details = app.evaluate_speech_clarity('yo como pan hoy', words_data)['details']
+    assert details['thinking_pauses'] == 0
+    assert details['disruptive_pauses'] == 1
+
+
+def test_pause_after_sentence_punctuation_is_thinking():
+    """A long pause after a sentence boundary is a thinking pause"""
+    words_data = _words(('mi', 0), ('casa.', 0.1), ('Tengo', 1.5), ('perro', 0.1))
+    details = app.evaluate_speech_clarity('mi casa. Tengo perro', words_data)['details']
+    assert details['thinking_pauses'] == 1
+    assert details['disruptive_pauses'] == 0
+
+
+def test_micro_pauses_count_only_gaps_between_0_3_and_1_2_seconds():
+    """C1.3 micro-pauses exclude short gaps and C1.2 pauses"""
+    words_data = _words(('yo', 0), ('como', 0.5), ('pan', 1.3), ('hoy', 0.1), ('aquí', 1.19))
+    details = app.evaluate_speech_clarity('yo como pan hoy aquí', words_data)['details']
+    assert details['micro_pauses'] == 2
+    assert details['disruptive_pauses'] == 1
+
+
+def test_words_without_timing_return_no_timing_result():
+    """Missing word timing is reported instead of raising"""
+    result = app.evaluate_speech_clarity('yo soy Ana', [{'word': 'yo'}, {'word': 'soy'}, {'word': 'Ana'}])
+    assert result['score'] == 70
+    assert result['details'] == {'note': 'No timing data available'}
+
+
+# ===== C2: COMMUNICATIVE FUNCTION =====
+
+@pytest.mark.parametrize('text', [
+    'yo soy Ana y tengo veinte años',
+    'es importante que estudies para que puedas viajar',
+    'me desperté temprano y desperté a mi hermano',
+    'estoy hablando con mi madre, está cansada',
+    'tenga cuidado, haga la tarea por favor y coma bien',
+    'ayer fui al cine, era tarde y me gusta ir a comer',
+    'sería bueno si mis amigos van a venir'
+])
+def test_fused_structure_counts_match_per_pattern_counts(text):
+    """The fused sweeps count exactly what one findall per structure would"""
+    expected = {
+        structure: len(pattern.findall(text))
+        for structure, pattern in app.STRUCTURE_PATTERNS.items()
+    }
+    details = app.evaluate_communicative_function(text)['details']
+    assert details['structures_detected'] == expected
+
+
+# ===== C3: DISCOURSE ORGANIZATION =====
+
+def test_connectors_match_whole_words_only():
+    """'y' inside 'muy'/'hay' and 'si' inside 'casi' are not connectors"""
+    text = 'hay una casa muy bonita casi al lado del parque grande con flores rojas'
+    counts = app.evaluate_discourse_organization(text)['details']['connector_counts']
+    assert counts['additive'] == 0
+    assert counts['condition'] == 0
+
+    counts = app.evaluate_discourse_organization('la casa y el parque si quieres')['details']['connector_counts']
+    assert counts['additive'] == 1
+    assert counts['condition'] == 1
+
+
+def test_repeated_connectors_are_all_counted():
+    """Back-to-back repeats of a phrase or word connector each count"""
+    counts = app.evaluate_discourse_organization('por eso por eso lo hice')['details']['connector_counts']
+    assert counts['causal'] == 2
+
+    counts = app.evaluate_discourse_organization('pero pero no quiero')['details']['connector_counts']
+    assert counts['contrast'] == 2
+
+
+def test_connector_types_keep_union_across_levels():
+    """'contrast' counts the beginner 'pero' and the advanced 'sin embargo'"""
+    text = 'me gusta el café pero no el té, sin embargo bebo agua'
+    counts = app.evaluate_discourse_organization(text)['details']['connector_counts']
+    assert counts['contrast'] == 2
+    assert counts['concession'] == 1
+
+
+def test_discourse_markers_match_whole_words_only():
+    """Descriptive markers inside longer words do not count"""
+    text = 'los estudiantes tienen clases y hayas estado con ellos ayer por la tarde'
+    details = app.evaluate_discourse_organization(text)['details']
+    assert details['discourse_type'] == 'conversational'
+
+    text = 'la casa es grande, está en el centro y hay un jardín con muchas flores'
+    details = app.evaluate_discourse_organization(text)['details']
+    assert details['discourse_type'] == 'descriptive'
+
+
+# ===== C4: LEXICAL USE =====
+
+def test_topic_keywords_match_whole_words_only():
+    """'hora' inside 'ahora' is not a beginner keyword"""
+    assert app.evaluate_lexical_use('ahora', level='beginner')['details']['topic_keywords_found'] == 0
+    assert app.evaluate_lexical_use('la hora', level='beginner')['details']['topic_keywords_found'] == 1